@@ -0,0 +1,219 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from modules.spatial_index import SpatialIndex, area_contains
+from modules.search_index import SearchIndex, NUMERIC_FIELDS, tokenize
+
+class ResultTableModel(QAbstractTableModel):
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.columns = []
+        self.spatial_index = SpatialIndex()
+        self.search_index = SearchIndex()
+        self.area = None
+        self.search_terms = []
+        self.sort_key = None
+        self.descending = False
+        self.view = None
+
+    def set_columns(self, data_keys):
+        self.beginResetModel()
+        self.columns = list(data_keys.items())
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.store) if self.view is None else len(self.view)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        key = self.columns[index.column()][1]
+        return self.format_value(self.store.row(self.store_row(index.row())).get(key))
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section][0] if section < len(self.columns) else None
+        return str(self.store_row(section) + 1)
+
+    @staticmethod
+    def format_value(value):
+        if not value:
+            return ""
+        if isinstance(value, (list, tuple)):
+            return ", ".join(map(str, value))
+        return str(value)
+
+    def is_filtered(self):
+        return self.area is not None or bool(self.search_terms)
+
+    @property
+    def visible_rows(self):
+        if self.view is None:
+            return None
+        return self.view[::-1] if self.descending else list(self.view)
+
+    def _view_position(self, row):
+        return len(self.view) - 1 - row if self.descending else row
+
+    def store_row(self, row):
+        if self.view is None:
+            return row
+        return self.view[self._view_position(row)]
+
+    def view_row(self, store_row):
+        if self.view is None:
+            return store_row
+        position = self._find(store_row)
+        return None if position is None else self._view_position(position)
+
+    def _row_key(self, row):
+        if self.sort_key is None:
+            return row
+        if self.sort_key in NUMERIC_FIELDS:
+            return (self.search_index.number(self.sort_key, row), row)
+        return (self.store.sort_key(self.sort_key, row), row)
+
+    def _bisect(self, key):
+        low, high = 0, len(self.view)
+        while low < high:
+            middle = (low + high) // 2
+            if self._row_key(self.view[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, row):
+        position = self._bisect(self._row_key(row))
+        if position < len(self.view) and self.view[position] == row:
+            return position
+        return None
+
+    def _in_order(self, position):
+        key = self._row_key(self.view[position])
+        return (position == 0 or self._row_key(self.view[position - 1]) < key) and (
+            position == len(self.view) - 1 or key < self._row_key(self.view[position + 1])
+        )
+
+    def _matches(self, place):
+        return self.in_area(place.get("lat_long")) and (
+            not self.search_terms or SearchIndex.matches(place, self.search_terms)
+        )
+
+    def in_area(self, lat_long):
+        if self.area is None:
+            return True
+        return bool(lat_long) and area_contains(self.area, lat_long[0], lat_long[1])
+
+    def _build_view(self):
+        if not self.is_filtered() and self.sort_key is None:
+            return None
+        rows = None
+        if self.area is not None:
+            rows = self.spatial_index.select(self.area)
+        if self.search_terms:
+            found = self.search_index.search(self.search_terms)
+            rows = found if rows is None else sorted(set(rows).intersection(found))
+        if self.sort_key is None:
+            return rows
+        if self.sort_key in NUMERIC_FIELDS:
+            return sorted(range(len(self.store)) if rows is None else rows, key=self._row_key)
+        ordered = self.store.sorted_indexes(self.sort_key)
+        if rows is None:
+            return ordered
+        selected = set(rows)
+        return [row for row in ordered if row in selected]
+
+    def _refresh_view(self):
+        self.beginResetModel()
+        self.view = self._build_view()
+        self.endResetModel()
+
+    def set_area(self, area):
+        self.area = area
+        self._refresh_view()
+
+    def set_search(self, text):
+        self.search_terms = tokenize(text)
+        self._refresh_view()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sort_key = self.columns[column][1] if 0 <= column < len(self.columns) else None
+        self.descending = self.sort_key is not None and order == Qt.SortOrder.DescendingOrder
+        self._refresh_view()
+
+    def _index_place(self, row, place):
+        lat_long = place.get("lat_long")
+        if lat_long:
+            self.spatial_index.add(row, lat_long[0], lat_long[1])
+        self.search_index.add(row, place)
+
+    def _insert_row(self, row):
+        position = self._bisect(self._row_key(row))
+        view_row = len(self.view) - position if self.descending else position
+        self.beginInsertRows(QModelIndex(), view_row, view_row)
+        self.view.insert(position, row)
+        self.endInsertRows()
+
+    def _remove_position(self, position):
+        view_row = self._view_position(position)
+        self.beginRemoveRows(QModelIndex(), view_row, view_row)
+        del self.view[position]
+        self.endRemoveRows()
+
+    def _row_changed(self, row, old_position):
+        if self.view is None:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, max(len(self.columns) - 1, 0)))
+            return
+        visible = self._matches(self.store.row(row))
+        if old_position is not None:
+            if visible and self._in_order(old_position):
+                view_row = self._view_position(old_position)
+                self.dataChanged.emit(self.index(view_row, 0), self.index(view_row, max(len(self.columns) - 1, 0)))
+                return
+            self._remove_position(old_position)
+        if visible:
+            self._insert_row(row)
+
+    def add_place(self, place):
+        row = self.store.index_of(place.get("feature_id"))
+        if row is None:
+            row = len(self.store)
+            if self.view is None:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.store.upsert(place)
+                self.endInsertRows()
+                self._index_place(row, place)
+                return
+            self.store.upsert(place)
+            self._index_place(row, place)
+            if self._matches(place):
+                self._insert_row(row)
+            return
+        old_position = None if self.view is None else self._find(row)
+        self.store.upsert(place)
+        self._index_place(row, place)
+        self._row_changed(row, old_position)
+
+    def update_fields(self, feature_id, fields):
+        row = self.store.index_of(feature_id)
+        if row is None:
+            return
+        old_position = None if self.view is None else self._find(row)
+        self.store.merge_fields(feature_id, fields)
+        self._index_place(row, fields)
+        self._row_changed(row, old_position)
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self.spatial_index = SpatialIndex()
+        self.search_index = SearchIndex()
+        self.view = self._build_view()
+        self.endResetModel()
@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import sys
+from modules.exporter import EXPORTERS, FLAT_FORMATS, ExportRows, get_exporter
+from modules.result_store import ResultStore, StoreSelection
+from modules.spatial_index import SpatialIndex, parse_area
+from modules.geo_tiles import GeoTile
+from modules.refresh import RefreshBaseline
+from modules.dedup import assign_clusters
+from modules.filters import PlaceFilter
+from modules.query_source import QuerySource, ListQuerySource, ChainedQuerySource
+from modules.dead_letter import DeadLetterQueue
+from utils.proxy_pool import ProxyPool
+from utils.constants import CHECKBOX_OPTIONS
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Google Business Scraper without the GUI.")
+    parser.add_argument("-q", "--query", action="append", default=[], help="Search query, can be repeated.")
+    parser.add_argument("-f", "--queries-file", help="Text file with one query per line, or a CSV file.")
+    parser.add_argument("--template", help="Build queries from the CSV columns, e.g. \"{category} in {city}\" for every category/city pair.")
+    parser.add_argument("-o", "--output", required=True, help="Output file path.")
+    parser.add_argument("--format", choices=list(EXPORTERS), help="Output format, inferred from the output extension by default.")
+    parser.add_argument("--options", default=",".join(CHECKBOX_OPTIONS), help="Comma separated fields to collect.")
+    parser.add_argument("--store", help="SQLite file to keep results in, a temporary file by default.")
+    parser.add_argument("--concurrency", type=int, default=5, help="Number of queries processed concurrently.")
+    parser.add_argument("--bbox", help="Tile searches over south,west,north,east.")
+    parser.add_argument("--refresh", help="Previous result store (.sqlite3) or JSON with feature_id to refresh against.")
+    parser.add_argument("--refresh-max-age", type=float, help="Re-enrich unchanged places older than this many days.")
+    parser.add_argument("--diff", help="Write the refresh diff (added, removed, changed) to this JSON file.")
+    parser.add_argument("--proxies", help="Text file with one proxy URL per line.")
+    parser.add_argument("--proxy-rpm", type=int, default=60, help="Request budget per proxy per minute.")
+    parser.add_argument("--record", help="Record HTTP traffic to this cassette file.")
+    parser.add_argument("--replay", help="Replay HTTP traffic from this cassette file.")
+    parser.add_argument("--replay-timing-scale", type=float, default=1.0, help="Multiplier for recorded latencies, 0 disables them.")
+    parser.add_argument("--min-rating", type=float, help="Skip places rated below this before enrichment.")
+    parser.add_argument("--min-reviews", type=int, help="Skip places with fewer reviews before enrichment.")
+    parser.add_argument("--require-url", action="store_true", help="Skip places without a website.")
+    parser.add_argument("--require-phone", action="store_true", help="Skip places without a phone number.")
+    parser.add_argument("--title-regex", help="Keep only places whose title matches this pattern.")
+    parser.add_argument("--address-regex", help="Keep only places whose address matches this pattern.")
+    parser.add_argument("--within", help="Export only places inside lat,lng,meters, south,west,north,east or a polygon file.")
+    parser.add_argument("--dedup", action="store_true", help="Detect near-duplicate businesses and add a cluster_id column.")
+    parser.add_argument("--dead-letters", help="Write entity and website fetches that still failed after the retry pass to this JSONL file.")
+    parser.add_argument("--retry-failed", help="Retry the failed fetches in this JSONL file and merge the recovered fields into --store. The file is not modified, use --dead-letters to keep what still fails.")
+    parser.add_argument("--contact-pages", type=int, default=0, help="Also fetch up to this many contact/about pages per website when fields are still missing.")
+    parser.add_argument("--parse-workers", type=int, help="Processes used for HTML parsing and extraction, 0 parses on the event loop.")
+    parser.add_argument("--profile", nargs="?", const="profiles", help="Profile pipeline stages and write the report to this directory.")
+    return parser.parse_args(argv)
+
+def load_queries(args):
+    sources = [ListQuerySource(args.query)]
+    if args.queries_file:
+        sources.append(QuerySource.from_file(args.queries_file, args.template))
+    return ChainedQuerySource(sources)
+
+def write_json(data, file_path):
+    with open(file_path, 'w', encoding='utf-8') as json_file:
+        json.dump(data, json_file, ensure_ascii=False, indent=4)
+    logger.info("Refresh diff written to %s.", file_path)
+
+def main(argv=None):
+    args = parse_args(argv)
+    queries = load_queries(args)
+    try:
+        query_count = queries.count()
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    if not query_count and not args.retry_failed:
+        logger.error("No queries given, use --query or --queries-file.")
+        return 2
+    try:
+        area = parse_area(args.within) if args.within else None
+    except (ValueError, OSError) as e:
+        logger.error("Invalid --within area: %s", e)
+        return 2
+    if args.retry_failed and not args.store:
+        logger.error("--retry-failed needs the --store the failed places were scraped into.")
+        return 2
+
+    selected_keys = [key.strip() for key in args.options.split(",") if key.strip()]
+    unknown_keys = [key for key in selected_keys if key not in CHECKBOX_OPTIONS]
+    if unknown_keys:
+        logger.error("Unknown options: %s", ', '.join(unknown_keys))
+        return 2
+
+    export_format = args.format or os.path.splitext(args.output)[1].lstrip(".").upper()
+    if export_format not in EXPORTERS:
+        logger.error("Unsupported output format: %s", export_format)
+        return 2
+
+    try:
+        place_filter = PlaceFilter(
+            min_rating=args.min_rating,
+            min_reviews=args.min_reviews,
+            require_url=args.require_url,
+            require_phone=args.require_phone,
+            title_pattern=args.title_regex,
+            address_pattern=args.address_regex,
+        )
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+
+    client_options = {}
+    if args.replay:
+        client_options = {"replay_path": args.replay, "replay_timing_scale": args.replay_timing_scale}
+    elif args.record:
+        client_options = {"record_path": args.record}
+    if args.proxies and not args.replay:
+        client_options["proxy_pool"] = ProxyPool.from_file(args.proxies, requests_per_minute=args.proxy_rpm)
+
+    refresh_baseline = None
+    if args.refresh:
+        if args.store and os.path.abspath(args.store) == os.path.abspath(args.refresh):
+            logger.error("--store must differ from the --refresh baseline.")
+            return 2
+        try:
+            refresh_baseline = RefreshBaseline.load(args.refresh, args.refresh_max_age)
+        except (OSError, ValueError) as e:
+            logger.error("Could not load the refresh baseline: %s", e)
+            return 2
+
+    from modules.scraper import ScraperWorker
+
+    store = ResultStore(args.store)
+    worker = ScraperWorker(
+        queries=queries,
+        options={key: key in selected_keys for key in CHECKBOX_OPTIONS},
+        max_concurrent_requests=args.concurrency,
+        client_options=client_options,
+        bounding_box=GeoTile.parse(args.bbox) if args.bbox else None,
+        refresh_baseline=refresh_baseline,
+        profile_dir=args.profile,
+        place_filter=place_filter,
+        parse_workers=args.parse_workers,
+        dead_letters=DeadLetterQueue.load(args.retry_failed) if args.retry_failed else None,
+        dead_letter_path=args.dead_letters,
+        contact_pages=args.contact_pages
+    )
+    worker.update_data.connect(store.upsert)
+    worker.update_fields.connect(store.merge_fields)
+    if args.diff:
+        worker.refresh_diff_ready.connect(lambda diff: write_json(diff, args.diff))
+    logger.info("Starting headless scrape of %s queries.", query_count)
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        logger.warning("Interrupted, exporting the places collected so far.")
+
+    store.flush()
+    if args.dedup:
+        assign_clusters(store)
+        selected_keys.append("cluster_id")
+    places = store
+    if area is not None:
+        places = StoreSelection(store, SpatialIndex.from_store(store).select(area))
+        logger.info("%s places inside the --within area.", len(places))
+    data = ExportRows(places, selected_keys, flatten=export_format in FLAT_FORMATS)
+    try:
+        get_exporter(export_format).export(data, args.output)
+    except Exception:
+        store.close()
+        return 1
+    logger.info("Headless scrape finished with %s places.", len(store))
+    store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
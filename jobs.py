@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import sys
+from modules.job_runner import JobRunner
+from utils.proxy_pool import ProxyPool
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run recurring Google Business Scraper jobs in one process.")
+    parser.add_argument("config", help="JSON file with the job definitions.")
+    parser.add_argument("--once", action="store_true", help="Run every job once and exit instead of following the schedule.")
+    parser.add_argument("--state", help="Job state and history file, overrides state_file in the config.")
+    parser.add_argument("--max-jobs", type=int, help="Number of jobs run concurrently, overrides max_concurrent_jobs in the config.")
+    parser.add_argument("--proxies", help="Text file with one proxy URL per line, shared by all jobs.")
+    parser.add_argument("--proxy-rpm", type=int, default=60, help="Request budget per proxy per minute.")
+    parser.add_argument("--parse-workers", type=int, help="Processes used for HTML parsing and extraction, 0 parses on the event loop.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    runner_options = {"parse_workers": args.parse_workers}
+    if args.state:
+        runner_options["state_path"] = args.state
+    if args.max_jobs:
+        runner_options["max_concurrent_jobs"] = args.max_jobs
+    if args.proxies:
+        runner_options["client_options"] = {
+            "proxy_pool": ProxyPool.from_file(args.proxies, requests_per_minute=args.proxy_rpm)
+        }
+
+    try:
+        runner = JobRunner.from_file(args.config, **runner_options)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error("Could not load jobs from %s: %s", args.config, e)
+        return 2
+
+    logger.info("Loaded %s jobs from %s.", len(runner.jobs), args.config)
+    try:
+        asyncio.run(runner.run(once=args.once))
+    except KeyboardInterrupt:
+        logger.warning("Interrupted, running jobs were cancelled.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QWidget, QHBoxLayout, QFrame, QVBoxLayout, QPushButton
@@ -32,14 +33,12 @@ class MainWindow(QMainWindow):
         self.content_layout = QVBoxLayout(self.content_area)
         main_layout.addWidget(self.content_area)
         
-        self.pages = {page_id: page for page_id, page in self.page_manager.pages.items()}
-        
         self.current_page = None
         self.update_content("settings_page")
         self.sidebar.set_active_button(self.sidebar.findChild(QPushButton, "Ayarlar"))
         
         
-        logger.info(f"Pages initialized: {list(self.pages.keys())}")
+        logger.info(f"Pages initialized: {list(self.page_manager.pages.keys())}")
 
         try:
             self.load_stylesheet("styles/scraper_styles.qss")
@@ -74,12 +73,13 @@ class MainWindow(QMainWindow):
         if self.current_page:
             self.current_page.hide()
 
-        self.current_page = self.pages[page_id]
+        self.current_page = self.page_manager.get_page(page_id)
         if not self.current_page.isVisible():
             self.content_layout.addWidget(self.current_page)
         self.current_page.show()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     logger.info("Application started")
     app = QApplication(sys.argv)
     window = MainWindow()
@@ -0,0 +1,139 @@
+import asyncio
+import re
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlparse, unquote
+from modules.dedup import normalize_text
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+CONTACT_KEYWORDS = {
+    "iletisim": 10, "contact": 10, "contacts": 10, "ulasin": 9, "kontakt": 8, "contacto": 8, "impressum": 7,
+    "ulasim": 5, "hakkimizda": 5, "about": 5, "aboutus": 5, "kurumsal": 3, "company": 2, "team": 2, "ekibimiz": 2,
+}
+SKIPPED_EXTENSIONS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".zip", ".rar", ".mp4", ".mp3",
+    ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".css", ".js",
+)
+LINK_PATTERN = re.compile(r'<a\b[^>]*?\bhref\s*=\s*["\']?([^"\'\s>]+)[^>]*>(.*?)</a\s*>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+def site_host(url):
+    host = (urlparse(url if "://" in url else f"http://{url}").hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+def link_score(url, text):
+    words = normalize_text(unquote(urlparse(url).path) + " " + TAG_PATTERN.sub(" ", text)).replace("_", " ").split()
+    return max((CONTACT_KEYWORDS.get(word, 0) for word in words), default=0)
+
+def contact_links(html, base_url, limit):
+    if limit <= 0 or not base_url:
+        return []
+    base_url = base_url if "://" in base_url else f"http://{base_url}"
+    host = site_host(base_url)
+    home = base_url.split("#")[0].rstrip("/")
+    scores = {}
+    for href, text in LINK_PATTERN.findall(html):
+        if href.startswith(("#", "mailto:", "tel:", "javascript:")):
+            continue
+        url = urljoin(base_url, href.replace("&amp;", "&")).split("#")[0]
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or site_host(url) != host or url.rstrip("/") == home:
+            continue
+        if parsed.path.lower().endswith(SKIPPED_EXTENSIONS):
+            continue
+        score = link_score(url, text)
+        if score > scores.get(url, 0):
+            scores[url] = score
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], len(item[0])))
+    return [url for url, _ in ranked[:limit]]
+
+
+class HostLimiter:
+    def __init__(self, per_host=2):
+        self.per_host = per_host
+        self._hosts = {}
+
+    def __len__(self):
+        return len(self._hosts)
+
+    @contextmanager
+    def host(self, url):
+        host = site_host(url)
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = self._hosts[host] = [asyncio.Semaphore(self.per_host), 0]
+        entry[1] += 1
+        try:
+            yield entry[0]
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._hosts[host]
+
+
+class ContactCrawler:
+    def __init__(self, max_pages=3, per_host=2, host_limiter=None):
+        self.max_pages = max_pages
+        self.host_limiter = host_limiter if host_limiter is not None else HostLimiter(per_host)
+        self.sites = 0
+        self.requests = 0
+        self.skipped_requests = 0
+        self.fields_found = 0
+        self.completed_sites = 0
+
+    async def crawl(self, site_url, links, fields, option_keys, fetch_fields):
+        missing = [key for key in option_keys if not fields.get(key)]
+        links = links[:self.max_pages]
+        if not missing or not links:
+            return {}
+
+        self.sites += 1
+        found = {}
+        issued = 0
+
+        with self.host_limiter.host(site_url) as semaphore:
+            async def fetch(url):
+                nonlocal issued
+                async with semaphore:
+                    if not missing:
+                        return
+                    issued += 1
+                    try:
+                        page_fields = await fetch_fields(url, list(missing))
+                    except Exception as e:
+                        logger.debug("Contact page %s failed: %s", url, e)
+                        return
+                    for key, value in (page_fields or {}).items():
+                        if value and key in missing:
+                            found[key] = value
+                            missing.remove(key)
+
+            tasks = [asyncio.ensure_future(fetch(url)) for url in links]
+            try:
+                for next_result in asyncio.as_completed(tasks):
+                    await next_result
+                    if not missing:
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                self.requests += issued
+                self.skipped_requests += len(links) - issued
+
+        self.fields_found += len(found)
+        if not missing:
+            self.completed_sites += 1
+        return found
+
+    def log_summary(self):
+        if not self.sites:
+            return
+        logger.info(
+            "Contact pages: %d extra requests on %d sites filled %d fields (%.2f fields per request), "
+            "%d sites completed, %d requests saved by stopping early.",
+            self.requests, self.sites, self.fields_found,
+            self.fields_found / self.requests if self.requests else 0.0,
+            self.completed_sites, self.skipped_requests
+        )
@@ -7,15 +7,19 @@ logger = get_logger(__name__)
 class CsvExporter(Exporter):
     def export(self, data, file_path):
         try:
-            if data:
-                headers = data[0].keys()
+            rows = iter(data)
+            first_row = next(rows, None)
+            if first_row is not None:
+                headers = first_row.keys()
                 with open(file_path, 'w', newline='', encoding='utf-8') as csv_file:
                     writer = csv.DictWriter(csv_file, fieldnames=headers)
                     writer.writeheader()
-                    writer.writerows(data)
+                    writer.writerow(first_row)
+                    writer.writerows(rows)
                 
-                logger.info(f"Data successfully exported to CSV at {file_path}.")
+                logger.info("Data successfully exported to CSV at %s.", file_path)
             else:
                 logger.warning("No data provided for export. CSV file was not created.")
         except Exception as e:
-            logger.error(f"Failed to export data to CSV at {file_path}: {e}", exc_info=True)
+            logger.error("Failed to export data to CSV at %s: %s", file_path, e, exc_info=True)
+            raise
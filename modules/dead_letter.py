@@ -0,0 +1,77 @@
+import json
+import time
+from collections import Counter
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+ENTITY = "entity"
+WEBSITE = "website"
+
+def failure_reason(error):
+    import httpx
+
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"http_{error.response.status_code}"
+    if isinstance(error, httpx.ConnectError):
+        return "dns" if "DNS lookup failed" in str(error) else "connect_error"
+    if isinstance(error, httpx.TooManyRedirects):
+        return "too_many_redirects"
+    if isinstance(error, httpx.TransportError):
+        return "transport_error"
+    return "error"
+
+
+class DeadLetterQueue:
+    def __init__(self, entries=None):
+        self._entries = {}
+        for entry in entries or []:
+            self._entries[(entry["kind"], entry["feature_id"])] = entry
+
+    @classmethod
+    def load(cls, path):
+        entries = []
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    entries.append(json.loads(line))
+        queue = cls(entries)
+        logger.info("Loaded %d failed fetches from %s.", len(queue), path)
+        return queue
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(list(self._entries.values()))
+
+    def record(self, kind, place, error, reason=None):
+        key = (kind, place["feature_id"])
+        previous = self._entries.get(key)
+        self._entries[key] = {
+            "kind": kind,
+            "feature_id": place["feature_id"],
+            "url": place.get("url"),
+            "reason": reason or failure_reason(error),
+            "detail": str(error)[:200],
+            "attempts": previous["attempts"] + 1 if previous else 1,
+            "failed_at": int(time.time()),
+        }
+
+    def resolve(self, kind, feature_id):
+        self._entries.pop((kind, feature_id), None)
+
+    def reasons(self):
+        return Counter(entry["reason"] for entry in self._entries.values())
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            for entry in self._entries.values():
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        logger.info("%d failed fetches written to %s.", len(self), path)
+
+    def log_summary(self):
+        if self._entries:
+            logger.info("Dead-letter queue: %d failed fetches %s", len(self), dict(self.reasons().most_common()))
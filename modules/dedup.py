@@ -0,0 +1,163 @@
+import re
+import time
+import unicodedata
+from collections import defaultdict
+from urllib.parse import urlparse
+from modules.geo_tiles import encode_geohash, distance_meters
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+NAME_STOP_WORDS = {
+    "ltd", "sti", "san", "tic", "as", "a", "ve", "and", "the", "of", "co", "inc", "llc", "gmbh",
+    "sube", "subesi", "branch",
+}
+SHARED_DOMAINS = {
+    "facebook.com", "instagram.com", "linkedin.com", "twitter.com", "x.com", "youtube.com", "tiktok.com",
+    "google.com", "sites.google.com", "business.site", "wa.me", "linktr.ee",
+}
+
+def normalize_text(text):
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text.casefold().replace("ı", "i"))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(re.findall(r"\w+", text))
+
+def normalize_name(title):
+    return " ".join(token for token in normalize_text(title).split() if token not in NAME_STOP_WORDS)
+
+def normalize_phone(phone):
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) >= 7 else None
+
+def website_domain(url):
+    if not url:
+        return None
+    netloc = urlparse(url if "://" in url else f"http://{url}").netloc.lower().split(":")[0]
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    if not netloc or netloc in SHARED_DOMAINS or any(netloc.endswith(f".{domain}") for domain in SHARED_DOMAINS):
+        return None
+    return netloc
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def jaccard(first, second):
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class DuplicateDetector:
+    def __init__(self, name_threshold=0.8, phone_name_threshold=0.5, address_threshold=0.7,
+                 max_distance=150, max_block_size=500, geohash_precision=6):
+        self.name_threshold = name_threshold
+        self.phone_name_threshold = phone_name_threshold
+        self.address_threshold = address_threshold
+        self.max_distance = max_distance
+        self.max_block_size = max_block_size
+        self.geohash_precision = geohash_precision
+        self.records = []
+        self.blocks = defaultdict(list)
+        self.comparisons = 0
+        self.skipped_blocks = 0
+
+    def add(self, place):
+        feature_id = place.get("feature_id")
+        if not feature_id:
+            return
+        lat_long = place.get("lat_long")
+        lat_long = (float(lat_long[0]), float(lat_long[1])) if lat_long else None
+        record = (
+            feature_id,
+            normalize_name(place.get("title")),
+            normalize_text(place.get("address")),
+            normalize_phone(place.get("phone_number")),
+            website_domain(place.get("url")),
+            lat_long,
+        )
+        index = len(self.records)
+        self.records.append(record)
+        for key in self.block_keys(record):
+            self.blocks[key].append(index)
+
+    def block_keys(self, record):
+        _, name, _, phone, domain, lat_long = record
+        keys = []
+        if phone:
+            keys.append(f"p:{phone}")
+        if domain:
+            keys.append(f"d:{domain}")
+        area = ""
+        if lat_long:
+            geohash = encode_geohash(lat_long[0], lat_long[1], self.geohash_precision)
+            keys.append(f"g:{geohash}")
+            area = geohash[:4]
+        for token in set(name.split()):
+            if len(token) >= 3:
+                keys.append(f"n:{token}:{area}")
+        return keys
+
+    def is_match(self, first, second, name_similarity):
+        if first[3] and first[3] == second[3]:
+            return name_similarity >= self.phone_name_threshold
+        if name_similarity < self.name_threshold:
+            return False
+        if first[5] and second[5]:
+            return distance_meters(first[5], second[5]) <= self.max_distance
+        if first[2] and second[2]:
+            return jaccard(trigrams(first[2]), trigrams(second[2])) >= self.address_threshold
+        return bool(first[4]) and first[4] == second[4]
+
+    def clusters(self):
+        parent = list(range(len(self.records)))
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        for members in self.blocks.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_block_size:
+                self.skipped_blocks += 1
+                continue
+            name_grams = [trigrams(self.records[index][1]) for index in members]
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    root_i, root_j = find(members[i]), find(members[j])
+                    if root_i == root_j:
+                        continue
+                    self.comparisons += 1
+                    similarity = jaccard(name_grams[i], name_grams[j])
+                    if self.is_match(self.records[members[i]], self.records[members[j]], similarity):
+                        parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        return {record[0]: self.records[find(index)][0] for index, record in enumerate(self.records)}
+
+
+def assign_clusters(store, **kwargs):
+    started = time.perf_counter()
+    detector = DuplicateDetector(**kwargs)
+    for place in store:
+        detector.add(place)
+    clusters = detector.clusters()
+
+    cluster_sizes = defaultdict(int)
+    for feature_id, cluster_id in clusters.items():
+        cluster_sizes[cluster_id] += 1
+        store.upsert({"feature_id": feature_id, "cluster_id": cluster_id})
+    store.flush()
+
+    duplicates = sum(size - 1 for size in cluster_sizes.values())
+    logger.info(
+        "Dedup: %d places in %d clusters, %d near-duplicates. %d comparisons over %d blocks (%d oversized blocks skipped) in %.1fs.",
+        len(clusters), len(cluster_sizes), duplicates, detector.comparisons, len(detector.blocks),
+        detector.skipped_blocks, time.perf_counter() - started
+    )
+    return clusters
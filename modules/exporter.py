@@ -1,6 +1,37 @@
 from abc import ABC, abstractmethod
+from importlib import import_module
+from importlib.util import find_spec
+
+EXPORTERS = {
+    "JSON": ("modules.json_exporter", "JsonExporter"),
+    "CSV": ("modules.csv_exporter", "CsvExporter"),
+    "XLSX": ("modules.xlsx_exporter", "ExcelExporter"),
+}
+if find_spec("pyarrow") is not None:
+    EXPORTERS["PARQUET"] = ("modules.parquet_exporter", "ParquetExporter")
+FLAT_FORMATS = {"CSV", "XLSX"}
 
 class Exporter(ABC):
     @abstractmethod
     def export(self, data, file_path):
         pass
+
+class ExportRows:
+    def __init__(self, places, keys, flatten=False):
+        self.places = places
+        self.keys = keys
+        self.flatten = flatten
+
+    def __iter__(self):
+        for place in self.places:
+            row = {}
+            for key in self.keys:
+                value = place.get(key)
+                if self.flatten and isinstance(value, (list, tuple)):
+                    value = ", ".join(map(str, value))
+                row[key] = value
+            yield row
+
+def get_exporter(export_format):
+    module_name, class_name = EXPORTERS[export_format.upper()]
+    return getattr(import_module(module_name), class_name)()
@@ -0,0 +1,67 @@
+import re
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+class PlaceFilter:
+    def __init__(self, min_rating=None, min_reviews=None, require_url=False, require_phone=False,
+                 title_pattern=None, address_pattern=None):
+        self.min_rating = min_rating
+        self.min_reviews = min_reviews
+        self.require_url = require_url
+        self.require_phone = require_phone
+        self.title_pattern = self._compile(title_pattern, "title")
+        self.address_pattern = self._compile(address_pattern, "address")
+        self.checked = 0
+        self.rejected = 0
+
+    @staticmethod
+    def _compile(pattern, field):
+        if not pattern:
+            return None
+        try:
+            return re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Invalid {field} pattern '{pattern}': {e}") from e
+
+    @property
+    def is_active(self):
+        return any((
+            self.min_rating is not None, self.min_reviews is not None, self.require_url, self.require_phone,
+            self.title_pattern is not None, self.address_pattern is not None,
+        ))
+
+    def matches(self, place):
+        if self.min_rating is not None and (place.get("rating_score") or 0.0) < self.min_rating:
+            return False
+        if self.min_reviews is not None and (place.get("review_count") or 0) < self.min_reviews:
+            return False
+        if self.require_url and not place.get("url"):
+            return False
+        if self.require_phone and not place.get("phone_number"):
+            return False
+        if self.title_pattern is not None and not self.title_pattern.search(place.get("title") or ""):
+            return False
+        if self.address_pattern is not None and not self.address_pattern.search(place.get("address") or ""):
+            return False
+        return True
+
+    def apply(self, places):
+        kept = [place for place in places if self.matches(place)]
+        self.checked += len(places)
+        self.rejected += len(places) - len(kept)
+        return kept
+
+    def log_summary(self):
+        if self.checked:
+            logger.info(
+                "Filters skipped enrichment for %d of %d places (%.0f%%).",
+                self.rejected, self.checked, self.rejected / self.checked * 100
+            )
+
+    def __repr__(self):
+        return (
+            f"PlaceFilter(min_rating={self.min_rating}, min_reviews={self.min_reviews}, require_url={self.require_url}, "
+            f"require_phone={self.require_phone}, title={self.title_pattern and self.title_pattern.pattern!r}, "
+            f"address={self.address_pattern and self.address_pattern.pattern!r})"
+        )
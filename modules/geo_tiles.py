@@ -0,0 +1,98 @@
+import math
+
+class GeoTile:
+    def __init__(self, south, west, north, east, depth=0):
+        if south >= north or west >= east:
+            raise ValueError(f"Invalid bounding box: {south},{west},{north},{east}")
+        self.south = south
+        self.west = west
+        self.north = north
+        self.east = east
+        self.depth = depth
+
+    @classmethod
+    def parse(cls, text):
+        parts = [part.strip() for part in text.split(",")]
+        if len(parts) != 4:
+            raise ValueError("Bounding box must be given as south,west,north,east")
+        south, west, north, east = (float(part) for part in parts)
+        if not (-90 <= south <= 90 and -90 <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+            raise ValueError(f"Bounding box is out of range: {text}")
+        return cls(south, west, north, east)
+
+    @property
+    def center(self):
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    @property
+    def span(self):
+        return self.north - self.south, self.east - self.west
+
+    def contains(self, latitude, longitude):
+        return self.south <= latitude <= self.north and self.west <= longitude <= self.east
+
+    def split(self, parts):
+        lat_step = (self.north - self.south) / parts
+        lng_step = (self.east - self.west) / parts
+        return [
+            GeoTile(
+                self.south + row * lat_step,
+                self.west + col * lng_step,
+                self.south + (row + 1) * lat_step,
+                self.west + (col + 1) * lng_step,
+                self.depth,
+            )
+            for row in range(parts)
+            for col in range(parts)
+        ]
+
+    def subdivide(self):
+        children = self.split(2)
+        for child in children:
+            child.depth = self.depth + 1
+        return children
+
+    def search_params(self):
+        latitude, longitude = self.center
+        lat_span, lng_span = self.span
+        return {
+            "ll": f"{latitude:.6f},{longitude:.6f}",
+            "spn": f"{lat_span:.6f},{lng_span:.6f}",
+        }
+
+    def __repr__(self):
+        return f"GeoTile({self.south:.5f},{self.west:.5f},{self.north:.5f},{self.east:.5f}, depth={self.depth})"
+
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_METERS = 6_371_000
+
+def encode_geohash(latitude, longitude, precision=7):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, value_range = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = (bits << 1) | 1
+            value_range[0] = middle
+        else:
+            bits <<= 1
+            value_range[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+def distance_meters(first, second):
+    lat1, lng1 = map(math.radians, first)
+    lat2, lng2 = map(math.radians, second)
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
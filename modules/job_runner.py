@@ -0,0 +1,223 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from modules.exporter import EXPORTERS, FLAT_FORMATS, ExportRows, get_exporter
+from modules.result_store import ResultStore
+from modules.geo_tiles import GeoTile
+from modules.filters import PlaceFilter
+from modules.query_source import QuerySource, ListQuerySource, ChainedQuerySource
+from modules.parse_executor import ParseExecutor
+from utils.constants import CHECKBOX_OPTIONS
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+HISTORY_LIMIT = 50
+
+class JobDefinition:
+    def __init__(self, name, output, queries=None, queries_file=None, template=None, options=None,
+                 format=None, store=None, bbox=None, filters=None, interval_minutes=None, concurrency=5,
+                 contact_pages=0):
+        self.name = name
+        self.output = output
+        self.queries = queries or []
+        self.queries_file = queries_file
+        self.template = template
+        self.options = options if options is not None else list(CHECKBOX_OPTIONS)
+        self.format = (format or os.path.splitext(output)[1].lstrip(".")).upper()
+        self.store = store
+        self.bounding_box = GeoTile.parse(bbox) if bbox else None
+        self.place_filter = PlaceFilter(**(filters or {}))
+        self.interval_minutes = interval_minutes
+        self.concurrency = concurrency
+        self.contact_pages = contact_pages
+
+        unknown_keys = [key for key in self.options if key not in CHECKBOX_OPTIONS]
+        if unknown_keys:
+            raise ValueError(f"Job '{name}' has unknown options: {', '.join(unknown_keys)}")
+        if self.format not in EXPORTERS:
+            raise ValueError(f"Job '{name}' has an unsupported output format: {self.format}")
+        if not self.queries and not self.queries_file:
+            raise ValueError(f"Job '{name}' has no queries.")
+
+    @classmethod
+    def from_dict(cls, data):
+        try:
+            return cls(**data)
+        except TypeError as e:
+            raise ValueError(f"Invalid job definition {data.get('name', '')!r}: {e}") from e
+
+    def query_source(self):
+        sources = [ListQuerySource(self.queries)]
+        if self.queries_file:
+            sources.append(QuerySource.from_file(self.queries_file, self.template))
+        return ChainedQuerySource(sources)
+
+    def output_path(self, started_at):
+        return self.output.format(date=datetime.fromtimestamp(started_at).strftime("%Y-%m-%d_%H-%M-%S"), name=self.name)
+
+
+class JobRunner:
+    def __init__(self, jobs, state_path="jobs_state.json", max_concurrent_jobs=2, client_options=None, parse_workers=None):
+        names = [job.name for job in jobs]
+        if len(set(names)) != len(names):
+            raise ValueError("Job names must be unique.")
+        self.jobs = jobs
+        self.state_path = state_path
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.client_options = client_options if client_options is not None else {}
+        self.parse_workers = parse_workers
+        self.state = self.load_state()
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path, 'r', encoding='utf-8') as file:
+            config = json.load(file)
+        if isinstance(config, list):
+            config = {"jobs": config}
+        jobs = [JobDefinition.from_dict(job) for job in config["jobs"]]
+        kwargs.setdefault("state_path", config.get("state_file", "jobs_state.json"))
+        kwargs.setdefault("max_concurrent_jobs", config.get("max_concurrent_jobs", 2))
+        return cls(jobs, **kwargs)
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return {"jobs": {}}
+        with open(self.state_path, 'r', encoding='utf-8') as file:
+            state = json.load(file)
+        for job_state in state.get("jobs", {}).values():
+            if job_state.get("status") == "running":
+                job_state["status"] = "interrupted"
+        return state
+
+    def save_state(self):
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        handle, temp_path = tempfile.mkstemp(prefix=".jobs_state_", suffix=".json", dir=directory)
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            json.dump(self.state, file, ensure_ascii=False, indent=4)
+        os.replace(temp_path, self.state_path)
+
+    def job_state(self, job):
+        return self.state["jobs"].setdefault(job.name, {"status": "pending", "next_run": None, "history": []})
+
+    def next_run(self, job):
+        job_state = self.job_state(job)
+        if not job_state["history"]:
+            return 0.0
+        return job_state["next_run"]
+
+    async def run(self, once=False):
+        from utils import fetch_utils
+        from modules.scraper import EnrichmentLimits
+
+        session = fetch_utils.create_client(**self.client_options)
+        parse_executor = ParseExecutor(self.parse_workers)
+        limits = EnrichmentLimits()
+        semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+        running = {}
+        started_jobs = set()
+        try:
+            if not self.client_options.get("replay_path"):
+                await fetch_utils.warm_up_client(session)
+            while True:
+                now = time.time()
+                for job in self.jobs:
+                    if job.name in running or (once and job.name in started_jobs):
+                        continue
+                    next_run = 0.0 if once else self.next_run(job)
+                    if next_run is not None and next_run <= now:
+                        started_jobs.add(job.name)
+                        running[job.name] = asyncio.create_task(self.run_job(job, session, parse_executor, limits, semaphore))
+
+                if once and not running:
+                    return
+                upcoming = [self.next_run(job) for job in self.jobs if job.name not in running]
+                upcoming = [next_run for next_run in upcoming if next_run is not None]
+                if not running and not upcoming:
+                    logger.info("No scheduled jobs left to run.")
+                    return
+                timeout = None if once or not upcoming else max(min(upcoming) - time.time(), 1.0)
+                if running:
+                    done, _ = await asyncio.wait(running.values(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                    for name in [name for name, task in running.items() if task in done]:
+                        task = running.pop(name)
+                        if not task.cancelled() and task.exception() is not None:
+                            logger.error("Job '%s' crashed: %s", name, task.exception())
+                else:
+                    await asyncio.sleep(timeout)
+        finally:
+            for task in running.values():
+                task.cancel()
+            await asyncio.gather(*running.values(), return_exceptions=True)
+            parse_executor.close()
+            session.transport_stats.log_summary()
+            if session.dns_cache is not None:
+                session.dns_cache.log_summary(sum(session.transport_stats.latencies["web"]))
+            if self.client_options.get("proxy_pool"):
+                self.client_options["proxy_pool"].log_summary()
+            await session.aclose()
+
+    async def run_job(self, job, session, parse_executor, limits, semaphore):
+        from modules.scraper import ScraperWorker
+
+        async with semaphore:
+            started_at = time.time()
+            job_state = self.job_state(job)
+            job_state["status"] = "running"
+            job_state["last_started"] = started_at
+            self.save_state()
+            logger.info("Starting job '%s'.", job.name)
+
+            store = ResultStore(job.store)
+            store.clear()
+            worker = ScraperWorker(
+                queries=job.query_source(),
+                options={key: key in job.options for key in CHECKBOX_OPTIONS},
+                max_concurrent_requests=job.concurrency,
+                bounding_box=job.bounding_box,
+                place_filter=job.place_filter,
+                contact_pages=job.contact_pages,
+            )
+            worker.update_data.connect(store.upsert)
+            worker.update_fields.connect(store.merge_fields)
+
+            run = {"started": started_at, "status": "ok", "error": None, "output": None, "places": 0}
+            try:
+                await worker.scrape(session=session, parse_executor=parse_executor, limits=limits)
+            except asyncio.CancelledError:
+                run["status"] = "cancelled"
+                raise
+            except Exception as e:
+                logger.error("Job '%s' failed: %s", job.name, e, exc_info=True)
+                run["status"] = "failed"
+                run["error"] = str(e)
+            finally:
+                try:
+                    store.flush()
+                    run["places"] = len(store)
+                    if run["status"] == "ok":
+                        output_path = job.output_path(started_at)
+                        data = ExportRows(store, job.options, flatten=job.format in FLAT_FORMATS)
+                        get_exporter(job.format).export(data, output_path)
+                        run["output"] = output_path
+                except Exception as e:
+                    logger.error("Job '%s' could not export its results: %s", job.name, e)
+                    run["status"] = "failed"
+                    run["error"] = str(e)
+                finally:
+                    store.close()
+                run["finished"] = time.time()
+                run["duration"] = run["finished"] - started_at
+
+                job_state["status"] = run["status"]
+                job_state["last_finished"] = run["finished"]
+                job_state["next_run"] = run["finished"] + job.interval_minutes * 60 if job.interval_minutes else None
+                job_state["history"] = (job_state["history"] + [run])[-HISTORY_LIMIT:]
+                self.save_state()
+                logger.info(
+                    "Job '%s' finished with status %s: %d places in %.1fs.",
+                    job.name, run["status"], run["places"], run["duration"]
+                )
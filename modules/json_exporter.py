@@ -1,4 +1,5 @@
 import json
+import textwrap
 from modules.exporter import Exporter
 from modules.logger import get_logger
 
@@ -8,8 +9,15 @@ class JsonExporter(Exporter):
     def export(self, data, file_path):
         try:
             with open(file_path, 'w', encoding='utf-8') as json_file:
-                json.dump(data, json_file, ensure_ascii=False, indent=4)
+                json_file.write("[")
+                count = 0
+                for row in data:
+                    json_file.write(",\n" if count else "\n")
+                    json_file.write(textwrap.indent(json.dumps(row, ensure_ascii=False, indent=4), "    "))
+                    count += 1
+                json_file.write("\n]" if count else "]")
             
-            logger.info(f"Data successfully exported to JSON at {file_path}.")
+            logger.info("Data successfully exported to JSON at %s.", file_path)
         except Exception as e:
-            logger.error(f"Failed to export data to JSON at {file_path}: {e}", exc_info=True)
+            logger.error("Failed to export data to JSON at %s: %s", file_path, e, exc_info=True)
+            raise
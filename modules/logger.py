@@ -1,38 +1,253 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
 
 LOG_DIR = "logs"
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_LEVELS_ENV = "GBS_LOG_LEVELS"
+SAMPLE_WINDOW_SECONDS = 10.0
+SAMPLE_BURST = 20
 
-def get_logger(module_name: str) -> logging.Logger:
-    date_str = datetime.now().strftime("%Y-%m-%d")
+_log_levels = {"": logging.DEBUG}
+_log_queue = queue.SimpleQueue()
+_listener = None
+_process_queue = None
+_listener_lock = threading.Lock()
+_module_loggers = {}
 
-    log_filename = os.path.join(LOG_DIR, f"{date_str}_{module_name}.log")
-    error_log_filename = os.path.join(LOG_DIR, f"{date_str}_error.log")
-    
-    logger = logging.getLogger(module_name)
-    logger.setLevel(logging.DEBUG)
 
-    if not logger.handlers:
-        file_handler = logging.FileHandler(log_filename, encoding="utf-8")
-        file_handler.setLevel(logging.DEBUG)
+class DeferredFileHandler(logging.FileHandler):
+    def __init__(self, filename, level=logging.NOTSET):
+        super().__init__(filename, encoding="utf-8", delay=True)
+        self.setLevel(level)
 
-        error_file_handler = logging.FileHandler(error_log_filename, encoding="utf-8")
-        error_file_handler.setLevel(logging.ERROR)
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class ConsoleHandler(logging.StreamHandler):
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class ModuleFileHandler(logging.Handler):
+    def __init__(self, log_dir):
+        super().__init__(logging.DEBUG)
+        self.log_dir = log_dir
+        self._handlers = {}
+
+    def emit(self, record):
+        handler = self._handlers.get(record.name)
+        if handler is None:
+            date_str = datetime.now().strftime("%Y-%m-%d")
+            handler = DeferredFileHandler(os.path.join(self.log_dir, f"{date_str}_{record.name}.log"))
+            handler.setFormatter(self.formatter)
+            self._handlers[record.name] = handler
+        handler.handle(record)
+
+    def close(self):
+        for handler in self._handlers.values():
+            handler.close()
+        super().close()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class ProcessQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        template = record.msg
+        record = super().prepare(record)
+        record.template = template
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, sink, window_seconds=SAMPLE_WINDOW_SECONDS, burst=SAMPLE_BURST, warning_burst=1):
+        super().__init__()
+        self.sink = sink
+        self.window_seconds = window_seconds
+        self.burst = burst
+        self.warning_burst = warning_burst
+        self._windows = {}
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = (record.name, record.levelno, getattr(record, "template", record.msg))
+        burst = self.warning_burst if record.levelno >= logging.WARNING else self.burst
+        now = time.monotonic()
+        with self._lock:
+            summaries = []
+            if now >= self._next_sweep:
+                summaries = self._sweep(now)
+                self._next_sweep = now + self.window_seconds
+            window_start, count, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - window_start >= self.window_seconds:
+                if suppressed:
+                    summaries.append(self._summary(key, suppressed))
+                window_start, count, suppressed = now, 0, 0
+            passed = count < burst
+            self._windows[key] = (window_start, count + 1, suppressed) if passed else (window_start, count, suppressed + 1)
+
+        for summary in summaries:
+            self.sink(summary)
+        return passed
+
+    def _sweep(self, now, force=False):
+        summaries = []
+        for key, (window_start, _, suppressed) in list(self._windows.items()):
+            if force or now - window_start >= self.window_seconds:
+                del self._windows[key]
+                if suppressed:
+                    summaries.append(self._summary(key, suppressed))
+        return summaries
+
+    def _summary(self, key, suppressed):
+        name, levelno, msg = key
+        return logging.LogRecord(
+            name, levelno, "", 0, "%d similar messages suppressed: %s", (suppressed, msg), None
+        )
+
+    def flush(self):
+        with self._lock:
+            summaries = self._sweep(time.monotonic(), force=True)
+        for summary in summaries:
+            self.sink(summary)
+
+
+_sampling_filter = SamplingFilter(_log_queue.put_nowait)
+
+
+def _level_number(level):
+    if isinstance(level, int):
+        return level
+    number = logging.getLevelName(str(level).strip().upper())
+    return number if isinstance(number, int) else None
 
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
 
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+def _parse_levels(spec):
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+        else:
+            name, level = "", item
+        levels[name.strip()] = _level_number(level)
+    return {name: level for name, level in levels.items() if level is not None}
 
-        file_handler.setFormatter(formatter)
+
+def level_for(module_name):
+    best_match = ""
+    for name in _log_levels:
+        if (module_name == name or module_name.startswith(f"{name}.")) and len(name) > len(best_match):
+            best_match = name
+    return _log_levels[best_match]
+
+
+def set_log_levels(levels):
+    for name, level in levels.items():
+        number = _level_number(level)
+        if number is not None:
+            _log_levels[name] = number
+    for name, logger in _module_loggers.items():
+        logger.setLevel(level_for(name))
+
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        module_file_handler = ModuleFileHandler(LOG_DIR)
+        module_file_handler.setFormatter(formatter)
+
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        error_file_handler = DeferredFileHandler(os.path.join(LOG_DIR, f"{date_str}_error.log"), logging.ERROR)
         error_file_handler.setFormatter(formatter)
+
+        console_handler = ConsoleHandler()
+        console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
 
-        logger.addHandler(file_handler)
-        logger.addHandler(error_file_handler)
-        logger.addHandler(console_handler)
+        _listener = logging.handlers.QueueListener(
+            _log_queue, module_file_handler, error_file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _sampling_filter.flush()
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def start_process_log_forwarding(context):
+    handler = DeferredQueueHandler(_log_queue)
+    handler.addFilter(_sampling_filter)
+    listener = logging.handlers.QueueListener(context.Queue(), handler)
+    listener.start()
+    return listener
+
+
+def init_process_logging(process_queue, levels):
+    global _process_queue
+    shutdown_logging()
+    _process_queue = process_queue
+    set_log_levels(levels)
+    for logger in _module_loggers.values():
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(ProcessQueueHandler(process_queue))
+
+
+def log_levels():
+    return dict(_log_levels)
+
+
+def get_logger(module_name: str) -> logging.Logger:
+    if _process_queue is None:
+        _start_listener()
+    logger = logging.getLogger(module_name)
+    logger.setLevel(level_for(module_name))
+    _module_loggers[module_name] = logger
+
+    if not logger.handlers:
+        if _process_queue is not None:
+            logger.addHandler(ProcessQueueHandler(_process_queue))
+        else:
+            queue_handler = DeferredQueueHandler(_log_queue)
+            queue_handler.addFilter(_sampling_filter)
+            logger.addHandler(queue_handler)
 
     return logger
+
+
+if os.environ.get(LOG_LEVELS_ENV):
+    _log_levels.update(_parse_levels(os.environ[LOG_LEVELS_ENV]))
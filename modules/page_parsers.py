@@ -0,0 +1,48 @@
+import re
+from bs4 import BeautifulSoup as bs
+from utils.constants import CHECKBOX_OPTIONS
+from modules.contact_crawler import contact_links
+
+def decode_body(content, encoding):
+    if isinstance(content, str):
+        return content
+    return content.decode(encoding or "utf-8", errors="replace")
+
+def parse_category(soup):
+    category_span = soup.find("span", class_="Qfo35d")
+    return category_span.text if category_span else None
+
+def parse_lat_long(soup):
+    map_div = soup.find('div', class_='jK1Lre')
+    if not map_div:
+        return None
+    map_link = map_div.find('a', href=True, text=re.compile('Google Haritalar'))
+    if not map_link:
+        return None
+
+    url = map_link['href']
+    match = re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', url)
+    if match:
+        latitude, longitude = match.groups()
+        return float(latitude), float(longitude)
+    return None
+
+def parse_entity_page(content, encoding, with_category, with_lat_long):
+    soup = bs(decode_body(content, encoding), 'html.parser')
+    fields = {}
+    if with_category:
+        fields['category'] = parse_category(soup)
+    if with_lat_long:
+        fields['lat_long'] = parse_lat_long(soup)
+    return fields
+
+def extract_website_fields(content, encoding, option_keys, base_url=None, link_limit=0):
+    page_content = decode_body(content, encoding)
+    fields = {}
+    errors = []
+    for option_key in option_keys:
+        try:
+            fields[option_key] = CHECKBOX_OPTIONS[option_key]["extractor"].extract(page_content)
+        except Exception as e:
+            errors.append((option_key, str(e)))
+    return fields, errors, contact_links(page_content, base_url, link_limit)
@@ -0,0 +1,77 @@
+from itertools import chain
+import pyarrow as pa
+import pyarrow.parquet as pq
+from modules.exporter import Exporter
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+LIST_COLUMNS = ("mail", "instagram", "facebook", "youtube", "linkedin", "twitter", "tiktok")
+ROW_GROUP_SIZE = 50_000
+
+def column_type(key):
+    if key == "rating_score" or key in ("latitude", "longitude"):
+        return pa.float64()
+    if key == "review_count":
+        return pa.int64()
+    if key in LIST_COLUMNS:
+        return pa.list_(pa.string())
+    return pa.string()
+
+def parquet_columns(keys):
+    columns = []
+    for key in keys:
+        if key == "lat_long":
+            columns.extend(["latitude", "longitude"])
+        else:
+            columns.append(key)
+    return columns
+
+def column_value(row, column):
+    if column in ("latitude", "longitude"):
+        lat_long = row.get("lat_long")
+        if not lat_long:
+            return None
+        return float(lat_long[0] if column == "latitude" else lat_long[1])
+    value = row.get(column)
+    if value is None or value == "":
+        return None
+    if column in LIST_COLUMNS:
+        return [str(item) for item in value] if isinstance(value, (list, tuple)) else [str(value)]
+    if column == "rating_score":
+        return float(value)
+    if column == "review_count":
+        return int(value)
+    return value if isinstance(value, str) else str(value)
+
+class ParquetExporter(Exporter):
+    def export(self, data, file_path):
+        rows = iter(data)
+        first_row = next(rows, None)
+        if first_row is None:
+            logger.warning("No data provided for export. Parquet file was not created.")
+            return
+
+        try:
+            columns = parquet_columns(first_row.keys())
+            schema = pa.schema([(column, column_type(column)) for column in columns])
+            row_count = 0
+            with pq.ParquetWriter(file_path, schema, compression="zstd") as writer:
+                buffer = {column: [] for column in columns}
+                buffered_rows = 0
+                for row in chain([first_row], rows):
+                    for column in columns:
+                        buffer[column].append(column_value(row, column))
+                    buffered_rows += 1
+                    if buffered_rows >= ROW_GROUP_SIZE:
+                        writer.write_table(pa.table(buffer, schema=schema), row_group_size=ROW_GROUP_SIZE)
+                        row_count += buffered_rows
+                        buffer = {column: [] for column in columns}
+                        buffered_rows = 0
+                if buffered_rows:
+                    writer.write_table(pa.table(buffer, schema=schema), row_group_size=ROW_GROUP_SIZE)
+                    row_count += buffered_rows
+            logger.info("%s rows successfully exported to Parquet at %s.", row_count, file_path)
+        except Exception as e:
+            logger.error("Failed to export data to Parquet at %s: %s", file_path, e, exc_info=True)
+            raise
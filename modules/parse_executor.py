@@ -0,0 +1,122 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from modules.logger import get_logger, init_process_logging, log_levels, start_process_log_forwarding
+
+logger = get_logger(__name__)
+
+def run_batch(jobs):
+    results = []
+    for func, args in jobs:
+        try:
+            results.append((True, func(*args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+class ParseExecutor:
+    def __init__(self, max_workers=None, batch_size=16, batch_delay=0.005, inline_threshold=2048):
+        if max_workers is None:
+            max_workers = max((os.cpu_count() or 1) - 1, 0)
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.inline_threshold = inline_threshold
+        self._pool = None
+        self._log_listener = None
+        if max_workers:
+            context = multiprocessing.get_context("spawn")
+            self._log_listener = start_process_log_forwarding(context)
+            self._pool = ProcessPoolExecutor(
+                max_workers, mp_context=context,
+                initializer=init_process_logging, initargs=(self._log_listener.queue, log_levels())
+            )
+        self._pending = []
+        self._flush_handle = None
+        self.inline_jobs = 0
+        self.offloaded_jobs = 0
+        self.batches = 0
+
+    async def submit(self, func, *args, size=0):
+        if self._pool is None or size < self.inline_threshold:
+            self.inline_jobs += 1
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((func, args, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self.batches += 1
+        self.offloaded_jobs += len(batch)
+        try:
+            pool_future = asyncio.wrap_future(self._pool.submit(run_batch, [(func, args) for func, args, _ in batch]))
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._run_inline(batch, e)
+            return
+        pool_future.add_done_callback(lambda done: self._resolve(batch, done))
+
+    def _resolve(self, batch, pool_future):
+        if pool_future.cancelled():
+            for _, _, future in batch:
+                future.cancel()
+            return
+        error = pool_future.exception()
+        if error is not None:
+            self._run_inline(batch, error)
+            return
+        for (_, _, future), (ok, value) in zip(batch, pool_future.result()):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _run_inline(self, batch, error):
+        if self._pool is not None:
+            logger.error("Parse process pool failed (%s), parsing inline from now on.", error)
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        for func, args, future in batch:
+            if future.done():
+                continue
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def close(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for _, _, future in self._pending:
+            future.cancel()
+        self._pending = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            self._log_listener = None
+
+    def log_summary(self):
+        logger.info(
+            "Parse executor: %d workers, %d jobs offloaded in %d batches, %d parsed inline.",
+            self.max_workers, self.offloaded_jobs, self.batches, self.inline_jobs
+        )
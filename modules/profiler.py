@@ -0,0 +1,234 @@
+import asyncio
+import contextvars
+import json
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+_stage_stack = contextvars.ContextVar("profiler_stage_stack", default=())
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class NullProfiler:
+    enabled = False
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+
+class _Stage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def _start(self, measure_cpu):
+        self.frame = {"name": self.name, "child_wall": 0.0}
+        self.parent_stack = _stage_stack.get()
+        self.token = _stage_stack.set(self.parent_stack + (self.frame,))
+        self.cpu_started = time.thread_time() if measure_cpu else None
+        self.wall_started = time.perf_counter()
+
+    def _finish(self):
+        wall = time.perf_counter() - self.wall_started
+        cpu = time.thread_time() - self.cpu_started if self.cpu_started is not None else None
+        _stage_stack.reset(self.token)
+        if self.parent_stack:
+            self.parent_stack[-1]["child_wall"] += wall
+        path = ";".join(frame["name"] for frame in self.parent_stack + (self.frame,))
+        self.profiler.record(self.name, path, wall, max(wall - self.frame["child_wall"], 0.0), cpu)
+
+    def __enter__(self):
+        self._start(measure_cpu=True)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._finish()
+        return False
+
+    async def __aenter__(self):
+        self._start(measure_cpu=False)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._finish()
+        return False
+
+
+class LoopLagMonitor:
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.samples = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - started - self.interval, 0.0)
+            self.samples += 1
+            self.total += lag
+            self.max = max(self.max, lag)
+
+    @property
+    def mean(self):
+        return self.total / self.samples if self.samples else 0.0
+
+    def summary(self):
+        return {"mean": self.mean, "max": self.max, "samples": self.samples}
+
+
+class StageProfiler:
+    enabled = True
+
+    def __init__(self, slow_callback_threshold=0.05, lag_interval=0.1):
+        self.slow_callback_threshold = slow_callback_threshold
+        self.stages = defaultdict(lambda: {"calls": 0, "wall": 0.0, "cpu": 0.0})
+        self.folded = defaultdict(float)
+        self.slow_callbacks = defaultdict(lambda: {"count": 0, "total": 0.0, "max": 0.0})
+        self.loop_lag = LoopLagMonitor(lag_interval)
+        self.started_at = None
+        self._original_handle_run = None
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def record(self, name, path, wall, self_wall, cpu):
+        stats = self.stages[name]
+        stats["calls"] += 1
+        stats["wall"] += wall
+        if cpu is not None:
+            stats["cpu"] += cpu
+        self.folded[path] += self_wall
+
+    def install(self):
+        self.started_at = time.perf_counter()
+        original_run = asyncio.events.Handle._run
+        profiler = self
+
+        def timed_run(handle):
+            started = time.perf_counter()
+            try:
+                original_run(handle)
+            finally:
+                duration = time.perf_counter() - started
+                if duration >= profiler.slow_callback_threshold:
+                    profiler.record_slow_callback(handle, duration)
+
+        self._original_handle_run = original_run
+        asyncio.events.Handle._run = timed_run
+        self.loop_lag.start()
+
+    def uninstall(self):
+        if self._original_handle_run is not None:
+            asyncio.events.Handle._run = self._original_handle_run
+            self._original_handle_run = None
+        self.loop_lag.stop()
+
+    def record_slow_callback(self, handle, duration):
+        callback = getattr(handle, "_callback", None)
+        owner = getattr(callback, "__self__", None)
+        if isinstance(owner, asyncio.Task):
+            key = owner.get_coro().__qualname__ if owner.get_coro() else repr(owner)
+        else:
+            key = getattr(callback, "__qualname__", repr(callback))
+        stats = self.slow_callbacks[key]
+        stats["count"] += 1
+        stats["total"] += duration
+        stats["max"] = max(stats["max"], duration)
+        self.folded[f"event_loop_blocking;{key}"] += duration
+
+    def report(self):
+        return {
+            "duration": time.perf_counter() - self.started_at if self.started_at else 0.0,
+            "stages": {name: dict(stats) for name, stats in sorted(self.stages.items())},
+            "slow_callbacks": {
+                name: dict(stats)
+                for name, stats in sorted(self.slow_callbacks.items(), key=lambda item: -item[1]["total"])
+            },
+            "loop_lag": self.loop_lag.summary(),
+        }
+
+    def write_report(self, output_dir):
+        report = self.report()
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = os.path.join(output_dir, f"profile_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}")
+        with open(f"{base_name}.json", 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, ensure_ascii=False, indent=4)
+        with open(f"{base_name}.folded", 'w', encoding='utf-8') as folded_file:
+            for path, seconds in sorted(self.folded.items()):
+                microseconds = int(seconds * 1_000_000)
+                if microseconds:
+                    folded_file.write(f"{path} {microseconds}\n")
+
+        for name, stats in report["stages"].items():
+            logger.info(
+                "Stage %-14s calls=%-7d wall=%9.2fs cpu=%8.2fs",
+                name, stats["calls"], stats["wall"], stats["cpu"]
+            )
+        logger.info(
+            "Event loop lag: mean %.1fms, max %.1fms. %d slow callback sources.",
+            report["loop_lag"]["mean"] * 1000, report["loop_lag"]["max"] * 1000, len(report["slow_callbacks"])
+        )
+        logger.info("Profile written to %s.json and %s.folded", base_name, base_name)
+        return report
+
+
+_active = NullProfiler()
+
+
+def stage(name):
+    return _active.stage(name)
+
+
+def is_enabled():
+    return _active.enabled
+
+
+def start_profiling(**kwargs):
+    global _active
+    if _active.enabled:
+        return _active
+    _active = StageProfiler(**kwargs)
+    _active.install()
+    logger.info("Stage profiling enabled.")
+    return _active
+
+
+def stop_profiling(output_dir="profiles"):
+    global _active
+    if not _active.enabled:
+        return None
+    profiler = _active
+    _active = NullProfiler()
+    profiler.uninstall()
+    return profiler.write_report(output_dir)
@@ -0,0 +1,92 @@
+import asyncio
+import heapq
+import itertools
+from collections import deque
+
+class SearchCursor:
+    def __init__(self, query, query_num, report, tile=None, prior_yield=10.0, recent_window=2):
+        self.query = query
+        self.query_num = query_num
+        self.report = report
+        self.tile = tile
+        self.prior_yield = prior_yield
+        self.start_index = 0
+        self.requests = 0
+        self.new_places = 0
+        self.consecutive_empty_pages = 0
+        self.recent_batches = deque(maxlen=recent_window)
+        self.finished = False
+        self.saturated = False
+        self.pruned = False
+
+    def record_batch(self, requests, returned, new):
+        self.requests += requests
+        self.new_places += new
+        self.recent_batches.append((requests, returned, new))
+
+    @property
+    def recent_yield(self):
+        if not self.recent_batches:
+            return self.prior_yield
+        requests = sum(batch[0] for batch in self.recent_batches)
+        new = sum(batch[2] for batch in self.recent_batches)
+        return new / requests if requests else 0.0
+
+    @property
+    def recent_duplicate_ratio(self):
+        returned = sum(batch[1] for batch in self.recent_batches)
+        new = sum(batch[2] for batch in self.recent_batches)
+        return 1 - new / returned if returned else 0.0
+
+    def __repr__(self):
+        location = f" in {self.tile}" if self.tile else ""
+        return f"SearchCursor({self.query!r}{location}, start={self.start_index}, yield={self.recent_yield:.2f})"
+
+
+class QueryScheduler:
+    def __init__(self, min_batches_before_prune=2, max_duplicate_ratio=0.9):
+        self.min_batches_before_prune = min_batches_before_prune
+        self.max_duplicate_ratio = max_duplicate_ratio
+        self._heap = []
+        self._counter = itertools.count()
+        self._active = 0
+        self._condition = asyncio.Condition()
+        self.pruned_count = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def should_prune(self, cursor):
+        return (
+            len(cursor.recent_batches) >= self.min_batches_before_prune
+            and cursor.recent_duplicate_ratio >= self.max_duplicate_ratio
+        )
+
+    def push_nowait(self, cursor):
+        heapq.heappush(self._heap, (-cursor.recent_yield, next(self._counter), cursor))
+
+    async def push(self, cursor):
+        async with self._condition:
+            self.push_nowait(cursor)
+            self._condition.notify()
+
+    async def acquire(self):
+        async with self._condition:
+            while not self._heap:
+                if self._active == 0:
+                    return None
+                await self._condition.wait()
+            _, _, cursor = heapq.heappop(self._heap)
+            self._active += 1
+            return cursor
+
+    async def release(self, cursor, follow_ups=()):
+        async with self._condition:
+            self._active -= 1
+            if cursor.pruned:
+                self.pruned_count += 1
+            if not cursor.finished:
+                self.push_nowait(cursor)
+            for follow_up in follow_ups:
+                self.push_nowait(follow_up)
+            self._condition.notify_all()
@@ -0,0 +1,111 @@
+import csv
+import itertools
+import os
+import string
+from abc import ABC, abstractmethod
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+class QuerySource(ABC):
+    _cached_count = None
+
+    @abstractmethod
+    def __iter__(self):
+        pass
+
+    def count(self):
+        if self._cached_count is None:
+            self._cached_count = self._count()
+        return self._cached_count
+
+    def _count(self):
+        return sum(1 for _ in self)
+
+    def preview(self, limit=5):
+        return list(itertools.islice(self, limit))
+
+    @staticmethod
+    def from_file(path, template=None):
+        if os.path.splitext(path)[1].lower() == ".csv":
+            return CsvQuerySource(path, template)
+        return TextQuerySource(path)
+
+
+class ListQuerySource(QuerySource):
+    def __init__(self, queries):
+        self.queries = [query.strip() for query in queries if query and query.strip()]
+
+    def __iter__(self):
+        return iter(self.queries)
+
+    def count(self):
+        return len(self.queries)
+
+
+class TextQuerySource(QuerySource):
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path, 'r', encoding='utf-8-sig') as file:
+            for line in file:
+                query = line.strip()
+                if query:
+                    yield query
+
+
+class CsvQuerySource(QuerySource):
+    def __init__(self, path, template=None):
+        self.path = path
+        self.template = template
+        self.fields = [field for _, field, _, _ in string.Formatter().parse(template) if field] if template else []
+
+    def _rows(self):
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as file:
+            yield from csv.DictReader(file)
+
+    def _column_values(self):
+        values = {field: {} for field in self.fields}
+        for row in self._rows():
+            for field in self.fields:
+                value = (row.get(field) or "").strip()
+                if value:
+                    values[field][value] = None
+        missing = [field for field, seen in values.items() if not seen]
+        if missing:
+            raise ValueError(f"Template fields have no values in {self.path}: {', '.join(missing)}")
+        return [list(values[field]) for field in self.fields]
+
+    def __iter__(self):
+        if not self.template:
+            with open(self.path, 'r', encoding='utf-8-sig', newline='') as file:
+                reader = csv.reader(file)
+                next(reader, None)
+                for row in reader:
+                    if row and row[0].strip():
+                        yield row[0].strip()
+            return
+
+        for combination in itertools.product(*self._column_values()):
+            yield self.template.format(**dict(zip(self.fields, combination)))
+
+    def _count(self):
+        if not self.template:
+            return super()._count()
+        total = 1
+        for values in self._column_values():
+            total *= len(values)
+        return total
+
+
+class ChainedQuerySource(QuerySource):
+    def __init__(self, sources):
+        self.sources = sources
+
+    def __iter__(self):
+        for source in self.sources:
+            yield from source
+
+    def count(self):
+        return sum(source.count() for source in self.sources)
@@ -0,0 +1,95 @@
+import json
+import os
+import sqlite3
+import time
+from modules.result_store import ResultStore
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+SEARCH_FIELDS = ("title", "address", "phone_number", "url", "rating_score", "review_count")
+CHANGE_FIELDS = ("rating_score", "review_count", "title", "address", "phone_number", "url")
+
+class RefreshBaseline:
+    def __init__(self, lookup, feature_ids, max_age_days=None):
+        self.lookup = lookup
+        self.feature_ids = feature_ids
+        self.max_age_seconds = max_age_days * 86400 if max_age_days is not None else None
+        self.added = []
+        self.changed = []
+        self.reused_count = 0
+        self.refreshed_count = 0
+
+    @classmethod
+    def load(cls, path, max_age_days=None):
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Refresh baseline not found: {path}")
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".json":
+            with open(path, 'r', encoding='utf-8') as file:
+                places = {place["feature_id"]: place for place in json.load(file) if place.get("feature_id")}
+            logger.info("Loaded refresh baseline with %d places from %s.", len(places), path)
+            return cls(places.get, lambda: iter(places), max_age_days)
+
+        try:
+            store = ResultStore(path, read_only=True)
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Refresh baseline {path} is not a result store: {e}") from e
+        logger.info("Using result store %s with %d places as refresh baseline.", path, len(store))
+        return cls(store.get, store.feature_ids, max_age_days)
+
+    def is_stale(self, previous, now):
+        if self.max_age_seconds is None:
+            return False
+        scraped_at = previous.get("scraped_at")
+        return scraped_at is None or now - scraped_at > self.max_age_seconds
+
+    def apply(self, places):
+        now = time.time()
+        needs_enrichment = []
+        for place in places:
+            previous = self.lookup(place["feature_id"])
+            if previous is None:
+                self.added.append(place)
+                needs_enrichment.append(place)
+                continue
+
+            changes = {
+                field: {"old": previous.get(field), "new": place.get(field)}
+                for field in CHANGE_FIELDS
+                if field in previous and previous.get(field) != place.get(field)
+            }
+            if changes:
+                self.changed.append({"feature_id": place["feature_id"], "title": place.get("title"), "changes": changes})
+
+            if self.is_stale(previous, now):
+                self.refreshed_count += 1
+                needs_enrichment.append(place)
+                continue
+
+            self.reused_count += 1
+            for key, value in previous.items():
+                if key not in SEARCH_FIELDS:
+                    place.setdefault(key, value)
+        return needs_enrichment
+
+    def build_diff(self, seen_feature_ids):
+        removed = []
+        for feature_id in self.feature_ids():
+            if feature_id not in seen_feature_ids:
+                removed.append(self.lookup(feature_id))
+
+        diff = {
+            "added": self.added,
+            "removed": removed,
+            "changed": self.changed,
+            "summary": {
+                "added": len(self.added),
+                "removed": len(removed),
+                "changed": len(self.changed),
+                "re_enriched_stale": self.refreshed_count,
+                "reused_enrichment": self.reused_count,
+            },
+        }
+        logger.info("Refresh diff: %s", diff["summary"])
+        return diff
@@ -0,0 +1,202 @@
+import atexit
+import json
+import os
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from urllib.request import pathname2url
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+def sort_text(value):
+    return str(value).casefold() if value is not None else ""
+
+class ResultStore:
+    PAGE_SIZE = 200
+    CACHED_PAGES = 10
+    COMMIT_EVERY = 500
+
+    def __init__(self, path=None, read_only=False):
+        self.owns_file = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(prefix="gbs_results_", suffix=".sqlite3")
+            os.close(handle)
+            atexit.register(self.close)
+        self.path = path
+        self.read_only = read_only
+        if read_only:
+            uri = f"file:{pathname2url(os.path.abspath(path))}?mode=ro"
+            self.connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS places ("
+                "row_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "feature_id TEXT UNIQUE, "
+                "data TEXT NOT NULL)"
+            )
+            self.connection.commit()
+        self.connection.create_function("sort_text", 1, sort_text, deterministic=True)
+        self._count = self.connection.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+        self._first_row_id = self._find_first_row_id()
+        self._pages = OrderedDict()
+        self._uncommitted = 0
+        logger.info("Result store opened at %s with %d rows.", path, self._count)
+
+    def _find_first_row_id(self):
+        first_row_id = self.connection.execute("SELECT MIN(row_id) FROM places").fetchone()[0]
+        if first_row_id is not None:
+            return first_row_id
+        return self.connection.execute(
+            "SELECT COALESCE(MAX(seq), 0) + 1 FROM sqlite_sequence WHERE name = 'places'"
+        ).fetchone()[0]
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        cursor = self.connection.execute("SELECT data FROM places ORDER BY row_id")
+        while True:
+            rows = cursor.fetchmany(self.PAGE_SIZE)
+            if not rows:
+                return
+            for (data,) in rows:
+                yield json.loads(data)
+
+    def feature_ids(self):
+        cursor = self.connection.execute("SELECT feature_id FROM places WHERE feature_id IS NOT NULL ORDER BY row_id")
+        for (feature_id,) in cursor:
+            yield feature_id
+
+    def index_of(self, feature_id):
+        if feature_id is None:
+            return None
+        row = self.connection.execute("SELECT row_id FROM places WHERE feature_id = ?", (feature_id,)).fetchone()
+        return row[0] - self._first_row_id if row else None
+
+    def get(self, feature_id):
+        row = self.connection.execute("SELECT data FROM places WHERE feature_id = ?", (feature_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def upsert(self, place):
+        feature_id = place.get("feature_id")
+        existing = None
+        if feature_id is not None:
+            existing = self.connection.execute(
+                "SELECT row_id, data FROM places WHERE feature_id = ?", (feature_id,)
+            ).fetchone()
+
+        if existing:
+            row_id, data = existing
+            merged = json.loads(data)
+            merged.update(place)
+            self.connection.execute(
+                "UPDATE places SET data = ? WHERE row_id = ?", (json.dumps(merged, ensure_ascii=False), row_id)
+            )
+            index = row_id - self._first_row_id
+            self._pages.pop(index // self.PAGE_SIZE, None)
+            inserted = False
+        else:
+            self.connection.execute(
+                "INSERT INTO places (feature_id, data) VALUES (?, ?)", (feature_id, json.dumps(place, ensure_ascii=False))
+            )
+            index = self._count
+            self._count += 1
+            self._pages.pop(index // self.PAGE_SIZE, None)
+            inserted = True
+
+        self._uncommitted += 1
+        if self._uncommitted >= self.COMMIT_EVERY:
+            self.flush()
+        return index, inserted
+
+    def merge_fields(self, feature_id, fields):
+        if self.index_of(feature_id) is None:
+            return None
+        index, _ = self.upsert({"feature_id": feature_id, **fields})
+        return index
+
+    def row(self, index):
+        page_index = index // self.PAGE_SIZE
+        page = self._pages.get(page_index)
+        if page is None:
+            first_row_id = self._first_row_id + page_index * self.PAGE_SIZE
+            rows = self.connection.execute(
+                "SELECT data FROM places WHERE row_id >= ? ORDER BY row_id LIMIT ?", (first_row_id, self.PAGE_SIZE)
+            ).fetchall()
+            page = [json.loads(data) for (data,) in rows]
+            self._pages[page_index] = page
+            if len(self._pages) > self.CACHED_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_index)
+        return page[index % self.PAGE_SIZE]
+
+    def rows(self, indexes):
+        row_ids = [self._first_row_id + index for index in indexes]
+        placeholders = ", ".join("?" * len(row_ids))
+        found = dict(self.connection.execute(
+            f"SELECT row_id, data FROM places WHERE row_id IN ({placeholders})", row_ids
+        ).fetchall())
+        return [json.loads(found[row_id]) for row_id in row_ids]
+
+    @staticmethod
+    def _sort_expression(field):
+        if not field.isidentifier():
+            raise ValueError(f"Invalid sort field: {field!r}")
+        return f"sort_text(json_extract(data, '$.{field}'))"
+
+    def sorted_indexes(self, field):
+        expression = self._sort_expression(field)
+        if not self.read_only:
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS places_sort_{field} ON places ({expression})")
+        cursor = self.connection.execute(f"SELECT row_id FROM places ORDER BY {expression}, row_id")
+        return [row_id - self._first_row_id for (row_id,) in cursor]
+
+    def sort_key(self, field, index):
+        row = self.connection.execute(
+            f"SELECT {self._sort_expression(field)} FROM places WHERE row_id = ?", (self._first_row_id + index,)
+        ).fetchone()
+        return row[0] if row else ""
+
+    def flush(self):
+        if self.connection is not None:
+            self.connection.commit()
+        self._uncommitted = 0
+
+    def clear(self):
+        self.connection.execute("DELETE FROM places")
+        self.connection.commit()
+        self._first_row_id = self._find_first_row_id()
+        self._count = 0
+        self._pages.clear()
+        self._uncommitted = 0
+
+    def close(self):
+        if self.connection is None:
+            return
+        self.flush()
+        self.connection.close()
+        self.connection = None
+        if self.owns_file:
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(self.path + suffix)
+                except OSError:
+                    pass
+
+
+class StoreSelection:
+    def __init__(self, store, indexes):
+        self.store = store
+        self.indexes = indexes
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __iter__(self):
+        for start in range(0, len(self.indexes), self.store.PAGE_SIZE):
+            yield from self.store.rows(self.indexes[start:start + self.store.PAGE_SIZE])
@@ -1,12 +1,20 @@
 import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup as bs
 import asyncio
+import threading
+import time
 from urllib.parse import unquote
 from PySide6.QtCore import QThread, Signal
 from utils import fetch_utils
 from utils.constants import CHECKBOX_OPTIONS
+from modules.query_scheduler import QueryScheduler, SearchCursor
+from modules import profiler
+from modules import page_parsers
+from modules.parse_executor import ParseExecutor
+from modules.query_source import QuerySource, ListQuerySource
+from modules.dead_letter import DeadLetterQueue, ENTITY, WEBSITE
+from modules.spatial_index import SpatialIndex
+from modules.contact_crawler import ContactCrawler, HostLimiter
 from modules.logger import get_logger
-import re
 
 logger = get_logger(__name__)
 
@@ -14,41 +22,48 @@ class GoogleEarthClient:
     BASE_URL = "https://www.google.com/earth/rpc/search"
     FEATURE_BASE_URL = "https://www.google.com/earth/rpc/entity"
 
-    def __init__(self, query, session, start=0):
+    def __init__(self, query, session, start=0, tile=None):
         self.query = query
         self.start = start
         self.session = session
+        self.tile = tile
         self.headers = {
             "User-Agent": "GoogleEarth/7.3.6.9796(Windows;Microsoft Windows (6.2.9200.0);tr;kml:2.2;client:Pro;type:default)",
-            "Accept-Encoding": "deflate, br",
+            "Accept-Encoding": fetch_utils.ACCEPT_ENCODING,
             "Accept-Language": "tr-TR,en,*"
         }
 
-    async def fetch_data(self, url, params):
+    async def fetch_data(self, url, params, raw=False, raise_errors=False):
         try:
             response = await self.session.get(url, headers=self.headers, params=params, timeout=15)
             response.raise_for_status()
+            if raw:
+                return response.content, response.encoding
             return response.text
-        except asyncio.TimeoutError:
-            logger.error(f"Timeout error for {url}")
-            return None
         except Exception as e:
-            logger.error(f"Error fetching data from {url}: {e}")
+            if raise_errors:
+                raise
+            if isinstance(e, asyncio.TimeoutError):
+                logger.error("Timeout error for %s", url)
+            else:
+                logger.error("Error fetching data from %s: %s", url, e)
             return None
 
-    async def fetch_category_data(self, feature_id):
+    async def fetch_category_data(self, feature_id, raw=False, raise_errors=False):
         if feature_id is None:
             return None
+        latitude, longitude = self.tile.center if self.tile else (0, 0)
         params = {
-            "lat": 0,
-            "lng": 0,
+            "lat": latitude,
+            "lng": longitude,
             "fid": feature_id,
             "hl": "tr",
             "gl": "tr",
             "client": "earth-client",
             "cv": "7.3.6.9796"
         }
-        return await self.fetch_data(self.FEATURE_BASE_URL, params)
+        async with profiler.stage("entity_fetch"):
+            return await self.fetch_data(self.FEATURE_BASE_URL, params, raw=raw, raise_errors=raise_errors)
 
     async def get_places(self):
         params = {
@@ -61,33 +76,12 @@ class GoogleEarthClient:
             "useragent": self.headers['User-Agent'],
             "output": "xml"
         }
-        xml_data = await self.fetch_data(self.BASE_URL, params)
-        return self.parse_xml(xml_data)
-
-    def parse_category_html(self, html_data):
-        if not html_data:
-            return None
-        soup = bs(html_data, 'html.parser')
-        category_span = soup.find("span", class_="Qfo35d")
-        return category_span.text if category_span else None
-    
-    def parse_lat_long_html(self, html_data):
-        if not html_data:
-            return None
-        soup = bs(html_data, 'html.parser')
-        map_div = soup.find('div', class_='jK1Lre')
-        if not map_div:
-            return None
-        map_link = map_div.find('a', href=True, text=re.compile('Google Haritalar'))
-        if not map_link:
-            return None
-        
-        url = map_link['href']
-        match = re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', url)
-        if match:
-            latitude, longitude = match.groups()
-            return float(latitude), float(longitude)
-        return None
+        if self.tile:
+            params.update(self.tile.search_params())
+        async with profiler.stage("search_fetch"):
+            xml_data = await self.fetch_data(self.BASE_URL, params)
+        with profiler.stage("xml_parse"):
+            return self.parse_xml(xml_data)
 
     def parse_xml(self, xml_data):
         if xml_data is None:
@@ -95,276 +89,636 @@ class GoogleEarthClient:
             return [], False
         
         try:
-            root = ET.fromstring(xml_data)
-            places_data = []
-            
-            omnibox_content = root.find(".//omnibox_content")
-            more_places_available = False
-            if omnibox_content is not None:
-                more_places_available = omnibox_content.get('more_place_cards_available') == 'true'
-
-            for place_card in root.findall(".//place_card"):
-                title_elem = place_card.find("title")
-                title = title_elem.text if title_elem is not None else "Unknown"
-                
-                address_lines = [line.text for line in place_card.findall("address_line") if line.text]
-                address = " ".join(address_lines) or None
-                
-                phone_number_elem = place_card.find("phone_number")
-                phone_number = phone_number_elem.text if phone_number_elem is not None else None
-                
-                feature_id_elem = place_card.find("feature_id")
-                feature_id = feature_id_elem.text if feature_id_elem is not None else None
-                
-                url = None
-                authority_page_link_elem = place_card.find("authority_page_link")
-                if authority_page_link_elem is not None:
-                    url_elem = authority_page_link_elem.find("url")
-                    if url_elem is not None and url_elem.text:
-                        raw_url = url_elem.text
-                        url_parts = raw_url.split("/url?q=")
-                        if len(url_parts) > 1:
-                            url = unquote(url_parts[-1].split("&opi=")[0])
-
-                rating_score = 0.0
-                review_count = 0
-                rating_elem = place_card.find("rating")
-                if rating_elem is not None:
-                    rating_score_attr = rating_elem.get("num_rating_stars")
-                    rating_score = float(rating_score_attr) if rating_score_attr else 0.0
-                    
-                    review_count_anchor = rating_elem.find(".//review_count/anchor_text")
-                    if review_count_anchor is not None and review_count_anchor.text:
-                        review_count_text = review_count_anchor.text.split()[0]
-                        try:
-                            review_count = int(review_count_text.replace(',', '').strip())
-                        except ValueError:
-                            review_count = 0
-                
-                places_data.append({
-                    "title": title,
-                    "address": address,
-                    "phone_number": phone_number,
-                    "feature_id": feature_id,
-                    "url": url,
-                    "rating_score": rating_score,
-                    "review_count": review_count
-                })
-            
-            logger.info(f"Successfully parsed {len(places_data)} places.")
-            return places_data, more_places_available
+            parser = PlaceCardParser()
+            places_data = list(parser.feed(xml_data))
+            places_data.extend(parser.close())
+            logger.info("Successfully parsed %s places.", len(places_data))
+            return places_data, parser.more_places_available
         except ET.ParseError as e:
-            logger.error(f"Error parsing XML data (ParseError): {e}. Data: {xml_data[:200]}...")
+            logger.error("Error parsing XML data (ParseError): %s. Data: %s...", e, xml_data[:200])
             return [], False
         except Exception as e:
-            logger.error(f"Error parsing XML data: {e}", exc_info=True)
+            logger.error("Error parsing XML data: %s", e, exc_info=True)
             return [], False
 
 
+class PlaceCardParser:
+    CARD_FIELDS = ("title", "phone_number", "feature_id")
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack = []
+        self._card = None
+        self._omnibox_seen = False
+        self.more_places_available = False
+
+    def feed(self, data):
+        self._parser.feed(data)
+        yield from self._read_events()
+
+    def close(self):
+        self._parser.close()
+        yield from self._read_events()
+
+    def _read_events(self):
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._on_start(elem)
+                continue
+
+            self._stack.pop()
+            parent_tag = self._stack[-1].tag if self._stack else None
+            if elem.tag == "place_card":
+                place = self._build_place(self._card)
+                self._card = None
+                elem.clear()
+                if self._stack and len(self._stack[-1]) and self._stack[-1][-1] is elem:
+                    del self._stack[-1][-1]
+                yield place
+            elif self._card is not None:
+                self._on_card_end(elem, parent_tag)
+
+    def _on_start(self, elem):
+        parent_tag = self._stack[-1].tag if self._stack else None
+        self._stack.append(elem)
+        if elem.tag == "omnibox_content" and not self._omnibox_seen:
+            self._omnibox_seen = True
+            self.more_places_available = elem.get('more_place_cards_available') == 'true'
+        elif elem.tag == "place_card":
+            self._card = {"address_lines": [], "rating_seen": False}
+        elif elem.tag == "rating" and parent_tag == "place_card" and not self._card["rating_seen"]:
+            self._card["rating_seen"] = True
+            rating_score_attr = elem.get("num_rating_stars")
+            self._card["rating_score"] = float(rating_score_attr) if rating_score_attr else 0.0
+
+    def _on_card_end(self, elem, parent_tag):
+        card = self._card
+        tag = elem.tag
+        if parent_tag == "place_card":
+            if tag in self.CARD_FIELDS and tag not in card:
+                card[tag] = elem.text
+            elif tag == "address_line" and elem.text:
+                card["address_lines"].append(elem.text)
+        elif tag == "url" and parent_tag == "authority_page_link":
+            if "raw_url" not in card and self._stack[-2].tag == "place_card":
+                card["raw_url"] = elem.text
+        elif tag == "anchor_text" and parent_tag == "review_count":
+            if "review_text" not in card and self._inside_card_rating():
+                card["review_text"] = elem.text
+
+    def _inside_card_rating(self):
+        for index in range(len(self._stack) - 1, 0, -1):
+            if self._stack[index].tag == "rating" and self._stack[index - 1].tag == "place_card":
+                return True
+        return False
+
+    def _build_place(self, card):
+        url = None
+        raw_url = card.get("raw_url")
+        if raw_url:
+            url_parts = raw_url.split("/url?q=")
+            if len(url_parts) > 1:
+                url = unquote(url_parts[-1].split("&opi=")[0])
+
+        review_count = 0
+        review_text = card.get("review_text")
+        if review_text:
+            review_count_text = review_text.split()[0]
+            try:
+                review_count = int(review_count_text.replace(',', '').strip())
+            except ValueError:
+                review_count = 0
+
+        return {
+            "title": card.get("title", "Unknown"),
+            "address": " ".join(card["address_lines"]) or None,
+            "phone_number": card.get("phone_number"),
+            "feature_id": card.get("feature_id"),
+            "url": url,
+            "rating_score": card.get("rating_score", 0.0),
+            "review_count": review_count
+        }
+
+
+class EnrichmentLimits:
+    def __init__(self, feature_requests=50, url_requests=30, contact_pages_per_host=2):
+        self.feature_semaphore = asyncio.Semaphore(feature_requests)
+        self.url_semaphore = asyncio.Semaphore(url_requests)
+        self.contact_hosts = HostLimiter(contact_pages_per_host)
+
+
 class ScraperWorker(QThread):
     update_data = Signal(dict)
+    update_fields = Signal(str, dict)
     finished = Signal()
+    stopped = Signal(dict)
+    refresh_diff_ready = Signal(dict)
     query_progress = Signal(str, int, int)
 
-    def __init__(self, queries, options=None, max_concurrent_requests=30):
+    def __init__(self, queries, options=None, max_concurrent_requests=30, client_options=None,
+                 bounding_box=None, initial_tile_grid=2, max_tile_depth=4, tile_result_cap=100,
+                 min_batches_before_prune=2, max_duplicate_ratio=0.9, refresh_baseline=None,
+                 profile_dir=None, place_filter=None, parse_workers=None, max_active_queries=None,
+                 dead_letters=None, dead_letter_path=None, retry_failed=True, max_retry_attempts=3,
+                 contact_pages=0):
         super().__init__()
-        self.queries = queries
+        self.queries = queries if isinstance(queries, QuerySource) else ListQuerySource(queries)
+        self.max_active_queries = max_active_queries or max_concurrent_requests * 2
         self.options = options if options is not None else {}
-        self.query_semaphore = asyncio.Semaphore(max_concurrent_requests)
-        self._stop_event = asyncio.Event()
+        self.client_options = client_options if client_options is not None else {}
+        self.bounding_box = bounding_box
+        self.initial_tile_grid = initial_tile_grid
+        self.max_tile_depth = max_tile_depth
+        self.tile_result_cap = tile_result_cap
+        self.coverage_reports = {}
+        self.max_concurrent_requests = max_concurrent_requests
+        self.min_batches_before_prune = min_batches_before_prune
+        self.max_duplicate_ratio = max_duplicate_ratio
+        self.refresh_baseline = refresh_baseline
+        self.profile_dir = profile_dir
+        self.parse_workers = parse_workers
+        self.dead_letters = dead_letters if dead_letters is not None else DeadLetterQueue()
+        self.dead_letter_path = dead_letter_path
+        self.retry_failed = retry_failed
+        self.max_retry_attempts = max_retry_attempts
+        self.parse_executor = None
+        self.contact_pages = contact_pages
+        self.contact_crawler = None
+        self.place_filter = place_filter if place_filter is not None and place_filter.is_active else None
+        if refresh_baseline is not None:
+            self.max_duplicate_ratio = float("inf")
+        self._stop_event = threading.Event()
+        self._stop_requested_at = None
+        self._loop = None
+        self._worker_tasks = []
+        self._enrichment_tasks = set()
+        self._pending_places = {}
+        self.limits = None
+        self._scheduler = None
+        self._query_iterator = None
+        self._total_queries = 0
+        self._queries_started = 0
+        self._active_queries = 0
+        self._started_at = None
+        self.rows_emitted = 0
         self.session = None
         self.global_seen_feature_ids = set()
+        self.spatial_index = SpatialIndex()
+        self._spatial_keys = {}
 
     def run(self):
         logger.info("Starting scraper worker thread.")
         try:
             asyncio.run(self.scrape())
         except Exception as e:
-            logger.error(f"Error in scraper worker: {e}", exc_info=True)
+            logger.error("Error in scraper worker: %s", e, exc_info=True)
         finally:
             self.finished.emit()
             logger.info("Scraper worker thread finished.")
 
-    async def scrape(self):
-        self.session = fetch_utils.create_client()
+    async def scrape(self, session=None, parse_executor=None, limits=None):
+        self._loop = asyncio.get_running_loop()
+        self.limits = limits if limits is not None else EnrichmentLimits()
+        if self.contact_pages:
+            self.contact_crawler = ContactCrawler(self.contact_pages, host_limiter=self.limits.contact_hosts)
+        self._started_at = time.perf_counter()
+        self.rows_emitted = 0
+        if self.profile_dir:
+            profiler.start_profiling()
+        loop_lag = profiler.LoopLagMonitor()
+        loop_lag.start()
+        owns_executor = parse_executor is None
+        self.parse_executor = ParseExecutor(self.parse_workers) if owns_executor else parse_executor
+        owns_session = session is None
+        self.session = fetch_utils.create_client(**self.client_options) if owns_session else session
+        scheduler = None
         try:
-            tasks = []
-            for i, query in enumerate(self.queries):
-                if self._stop_event.is_set():
-                    break
-                task = asyncio.create_task(self.fetch_places_for_query(query, i + 1, len(self.queries)))
-                tasks.append(task)
-            
-            await asyncio.gather(*tasks, return_exceptions=True)
-                
+            if owns_session and not self.client_options.get("replay_path"):
+                await fetch_utils.warm_up_client(self.session)
+
+            scheduler = QueryScheduler(
+                min_batches_before_prune=self.min_batches_before_prune,
+                max_duplicate_ratio=self.max_duplicate_ratio
+            )
+            self._scheduler = scheduler
+            self._total_queries = self.queries.count()
+            self._query_iterator = iter(self.queries)
+            self._queries_started = 0
+            self._active_queries = 0
+            self._feed_queries()
+
+            self._worker_tasks = [
+                asyncio.create_task(self.run_scheduler_worker(scheduler, self._total_queries))
+                for _ in range(self.max_concurrent_requests)
+            ]
+            await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+            await self._wait_for_enrichment()
+            logger.info("Scheduler finished, %s low-yield searches pruned early.", scheduler.pruned_count)
+            if self.retry_failed and not self._stop_event.is_set():
+                await self.retry_dead_letters()
+            if self._stop_event.is_set():
+                self._report_stopped(scheduler)
+            elif self.refresh_baseline is not None:
+                self.refresh_diff_ready.emit(self.refresh_baseline.build_diff(self.global_seen_feature_ids))
+        except asyncio.CancelledError:
+            self._stop_event.set()
+            self._report_stopped(scheduler)
+            raise
         finally:
-            if self.session:
+            for task in self._enrichment_tasks:
+                task.cancel()
+            await asyncio.gather(*self._enrichment_tasks, return_exceptions=True)
+            self._worker_tasks = []
+            self._loop = None
+            self._scheduler = None
+            self._query_iterator = None
+            self.dead_letters.log_summary()
+            if self.dead_letter_path:
+                self.dead_letters.save(self.dead_letter_path)
+            if owns_executor:
+                self.parse_executor.close()
+                self.parse_executor.log_summary()
+            self.parse_executor = None
+            loop_lag.stop()
+            elapsed = time.perf_counter() - self._started_at
+            logger.info(
+                "Emitted %d places in %.1fs (%.1f places/s), event loop lag mean %.1fms, max %.1fms.",
+                self.rows_emitted, elapsed, self.rows_emitted / elapsed if elapsed else 0.0,
+                loop_lag.mean * 1000, loop_lag.max * 1000
+            )
+            if self.place_filter is not None:
+                self.place_filter.log_summary()
+            if self.contact_crawler is not None:
+                self.contact_crawler.log_summary()
+            if self.session and owns_session:
                 logger.info("Closing HTTP session.")
+                self.session.transport_stats.log_summary()
+                if self.session.dns_cache is not None:
+                    self.session.dns_cache.log_summary(sum(self.session.transport_stats.latencies["web"]))
+                if self.client_options.get("proxy_pool"):
+                    self.client_options["proxy_pool"].log_summary()
                 await self.session.aclose()
-                self.session = None
+            self.session = None
+            if self.profile_dir:
+                profiler.stop_profiling(self.profile_dir)
             logger.info("Scraping process completed.")
 
-    async def fetch_places_for_query(self, query, query_num, total_queries):
-        async with self.query_semaphore:
+    def _report_stopped(self, scheduler):
+        incomplete = len(self._pending_places)
+        self._pending_places.clear()
+
+        summary = {
+            "incomplete_places": incomplete,
+            "pending_searches": len(scheduler) if scheduler else 0,
+            "unstarted_queries": self._total_queries - self._queries_started,
+            "stop_latency": time.perf_counter() - self._stop_requested_at if self._stop_requested_at else None,
+        }
+        logger.info("Scraping stopped: %s", summary)
+        self.stopped.emit(summary)
+
+    def _feed_queries(self):
+        while self._query_iterator is not None and self._active_queries < self.max_active_queries:
             if self._stop_event.is_set():
                 return
+            query = next(self._query_iterator, None)
+            if query is None:
+                self._query_iterator = None
+                return
+            self._queries_started += 1
+            self._active_queries += 1
+            for cursor in self.create_cursors(query, self._queries_started):
+                self._scheduler.push_nowait(cursor)
+
+    def create_cursors(self, query, query_num):
+        report = {"query": query, "open_cursors": 0, "tiles": 0, "subdivided": 0, "requests": 0, "places": 0}
+        self.coverage_reports[query] = report
+        tiles = self.bounding_box.split(self.initial_tile_grid) if self.bounding_box else [None]
+        report["open_cursors"] = len(tiles)
+        return [SearchCursor(query, query_num, report, tile=tile) for tile in tiles]
+
+    async def run_scheduler_worker(self, scheduler, total_queries):
+        while not self._stop_event.is_set():
+            cursor = await scheduler.acquire()
+            if cursor is None:
+                return
 
-            logger.info(f"Processing query {query_num}/{total_queries}: {query}")
-            client = GoogleEarthClient(query, self.session)
-            more_pages_exist = True
-            current_start_index = 0
-            total_processed_for_query = 0
-            consecutive_empty_batches = 0
-
-            while more_pages_exist and consecutive_empty_batches < 3:
-                if self._stop_event.is_set():
-                    return
-
-                try:
-                    batch_fetch_tasks = []
-                    max_offset_step_for_parallel = 50
-                    offset_fetch_step = 10
-                    
-                    for i in range(0, max_offset_step_for_parallel, offset_fetch_step):
-                        task = asyncio.create_task(
-                            GoogleEarthClient(query, self.session, current_start_index + i).get_places()
-                        )
-                        batch_fetch_tasks.append(task)
-                    
-                    batch_results = await asyncio.gather(*batch_fetch_tasks, return_exceptions=True)
-                    
-                    all_places_from_batch = []
-                    any_batch_has_more = False
-                    
-                    for result in batch_results:
-                        if self._stop_event.is_set():
-                            return
-
-                        if isinstance(result, tuple) and len(result) == 2:
-                            places, more_available = result
-                            if places:
-                                all_places_from_batch.extend(places)
-                                any_batch_has_more = any_batch_has_more or more_available
-                                consecutive_empty_batches = 0
-                            else:
-                                consecutive_empty_batches += 1
-                        elif isinstance(result, Exception):
-                            logger.error(f"Error in batch get_places for query '{query}': {result}")
-                            consecutive_empty_batches += 1
-                        else:
-                            consecutive_empty_batches += 1
-                    
-                    more_pages_exist = any_batch_has_more
-                    
-                    if not all_places_from_batch:
-                        logger.warning(f"No places found for query: {query} at start_index: {current_start_index}. Consecutive empty: {consecutive_empty_batches}")
-                        if not more_pages_exist:
-                            break
-                        current_start_index += offset_fetch_step * (max_offset_step_for_parallel // offset_fetch_step)
-                        continue
-                    
-                    current_start_index += len(all_places_from_batch)
-                    
-                    unique_places_to_process = []
-                    for place in all_places_from_batch:
-                        feature_id = place.get("feature_id")
-                        if feature_id and feature_id not in self.global_seen_feature_ids:
-                            unique_places_to_process.append(place)
-                            self.global_seen_feature_ids.add(feature_id)
-
-                    if not unique_places_to_process:
-                        logger.info(f"No new unique places found for query: {query}")
-                        if not more_pages_exist:
-                            break
-                        continue
-
-                    logger.info(f"Found {len(unique_places_to_process)} unique new places for query: {query}")
-
-                    await self.fetch_and_process_additional_info(unique_places_to_process, client)
-
-                    for place_data in unique_places_to_process:
-                        if self._stop_event.is_set():
-                            return
-                        self.update_data.emit(place_data)
-                        total_processed_for_query += 1
-
-                    self.query_progress.emit(query, total_processed_for_query, current_start_index)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing query '{query}' around start_index {current_start_index}: {e}", exc_info=True)
-                    consecutive_empty_batches += 1
-                    continue
-            logger.info(f"Finished processing query: {query}. Total processed: {total_processed_for_query}")
-
+            follow_ups = []
+            try:
+                if cursor.requests == 0 and cursor.tile is None:
+                    logger.info("Processing query %s/%s: %s", cursor.query_num, total_queries, cursor.query)
+                if not self._stop_event.is_set():
+                    follow_ups = await self.fetch_next_batch(scheduler, cursor)
+            except Exception as e:
+                logger.error("Error processing %s: %s", cursor, e, exc_info=True)
+                cursor.consecutive_empty_pages += 1
+                cursor.finished = cursor.consecutive_empty_pages >= 3
+            finally:
+                if cursor.finished:
+                    self.finish_cursor(cursor, follow_ups)
+                await scheduler.release(cursor, follow_ups)
+
+    async def fetch_next_batch(self, scheduler, cursor):
+        query = cursor.query
+        client = GoogleEarthClient(query, self.session, tile=cursor.tile)
+        offset_fetch_step = 10
+        max_offset_step_for_parallel = 50
+
+        batch_end = cursor.start_index + max_offset_step_for_parallel
+        if cursor.tile:
+            batch_end = min(batch_end, self.tile_result_cap)
+        offsets = range(cursor.start_index, batch_end, offset_fetch_step)
+        batch_results = await asyncio.gather(
+            *[GoogleEarthClient(query, self.session, offset, tile=cursor.tile).get_places() for offset in offsets],
+            return_exceptions=True
+        )
+        cursor.start_index = batch_end
+        cursor.report["requests"] += len(offsets)
+
+        all_places_from_batch = []
+        more_pages_exist = False
+        for result in batch_results:
+            if isinstance(result, tuple) and len(result) == 2 and result[0]:
+                places, more_available = result
+                all_places_from_batch.extend(places)
+                more_pages_exist = more_pages_exist or more_available
+                cursor.consecutive_empty_pages = 0
+            else:
+                if isinstance(result, Exception):
+                    logger.error("Error in batch get_places for query '%s': %s", query, result)
+                cursor.consecutive_empty_pages += 1
+
+        emitted = 0
+        if all_places_from_batch:
+            emitted = await self._process_new_places(query, all_places_from_batch, client)
+            cursor.report["places"] += emitted
+            self.query_progress.emit(query, cursor.report["places"], cursor.start_index)
+        else:
+            logger.warning("No places found for %s. Consecutive empty: %s", cursor, cursor.consecutive_empty_pages)
+        cursor.record_batch(len(offsets), len(all_places_from_batch), emitted)
+
+        if not more_pages_exist or cursor.consecutive_empty_pages >= 3:
+            cursor.finished = True
+        elif cursor.tile and cursor.start_index >= self.tile_result_cap:
+            cursor.finished = True
+            cursor.saturated = True
+            if cursor.tile.depth < self.max_tile_depth:
+                cursor.report["subdivided"] += 1
+                children = cursor.tile.subdivide()
+                cursor.report["open_cursors"] += len(children)
+                return [
+                    SearchCursor(
+                        query, cursor.query_num, cursor.report, tile=tile,
+                        prior_yield=cursor.recent_yield / (1 + self.spatial_index.count_in_tile(tile) / self.tile_result_cap)
+                    )
+                    for tile in children
+                ]
+            logger.warning("Tile %s is still saturated at maximum depth %s for query: %s", cursor.tile, self.max_tile_depth, query)
+        elif scheduler.should_prune(cursor):
+            cursor.finished = True
+            cursor.pruned = True
+            logger.info("Pruning %s: %.0f%% of recent results were duplicates.", cursor, cursor.recent_duplicate_ratio * 100)
+        return []
+
+    def finish_cursor(self, cursor, follow_ups):
+        report = cursor.report
+        report["open_cursors"] -= 1
+        if cursor.tile:
+            report["tiles"] += 1
+        if report["open_cursors"] > 0 or follow_ups:
+            return
+        self.coverage_reports.pop(report["query"], None)
+        self._active_queries -= 1
+        self._feed_queries()
+
+        if self.bounding_box:
+            places_per_request = report["places"] / report["requests"] if report["requests"] else 0.0
+            logger.info(
+                "Coverage for query '%s': %d unique places from %d requests over %d tiles (%d subdivided), %.2f places/request",
+                report['query'], report['places'], report['requests'], report['tiles'], report['subdivided'], places_per_request
+            )
+        else:
+            logger.info("Finished processing query: %s. Total processed: %s", report['query'], report['places'])
+
+    async def _process_new_places(self, query, places, client):
+        unique_places_to_process = []
+        for place in places:
+            feature_id = place.get("feature_id")
+            if feature_id and feature_id not in self.global_seen_feature_ids:
+                unique_places_to_process.append(place)
+                self.global_seen_feature_ids.add(feature_id)
+
+        if not unique_places_to_process:
+            logger.info("No new unique places found for query: %s", query)
+            return 0
+
+        logger.info("Found %s unique new places for query: %s", len(unique_places_to_process), query)
+        new_places_count = len(unique_places_to_process)
+        if self.place_filter is not None:
+            unique_places_to_process = self.place_filter.apply(unique_places_to_process)
+            if not unique_places_to_process:
+                return new_places_count
+
+        prefetch_dns = any(self.options.get(opt, False) for opt in CHECKBOX_OPTIONS if CHECKBOX_OPTIONS[opt].get("req", False))
+        for place_data in unique_places_to_process:
+            self._pending_places[place_data["feature_id"]] = place_data
+            if prefetch_dns:
+                fetch_utils.prefetch_host(self.session, place_data.get("url"))
+
+        places_to_enrich = unique_places_to_process
+        if self.refresh_baseline is not None:
+            places_to_enrich = self.refresh_baseline.apply(unique_places_to_process)
+            logger.info("Refresh mode: enriching %d of %d places for query: %s", len(places_to_enrich), len(unique_places_to_process), query)
+
+        scraped_at = int(time.time())
+        for place_data in places_to_enrich:
+            place_data["scraped_at"] = scraped_at
+        self._emit_base_rows(unique_places_to_process)
+        if not self._start_enrichment(places_to_enrich, client):
+            places_to_enrich = []
+
+        enriched_ids = {place_data["feature_id"] for place_data in places_to_enrich}
+        for place_data in unique_places_to_process:
+            if place_data["feature_id"] not in enriched_ids:
+                self._pending_places.pop(place_data["feature_id"], None)
+        return new_places_count
+
+    def _start_enrichment(self, places, client):
+        if not places or not any(self._enrichment_options()):
+            return False
+        task = asyncio.create_task(self.fetch_and_process_additional_info(places, client))
+        self._enrichment_tasks.add(task)
+        task.add_done_callback(self._enrichment_tasks.discard)
+        return True
+
+    async def _wait_for_enrichment(self):
+        while self._enrichment_tasks:
+            await asyncio.gather(*self._enrichment_tasks, return_exceptions=True)
+
+    def _emit_base_rows(self, places):
+        with profiler.stage("emit"):
+            for place_data in places:
+                self._index_location(place_data)
+                self.update_data.emit(dict(place_data))
+                self.rows_emitted += 1
+                if self.rows_emitted in (1, 1000):
+                    logger.info("Time to first %d rows: %.2fs", self.rows_emitted, time.perf_counter() - self._started_at)
+
+    def _deliver_fields(self, place, fields):
+        if not fields:
+            return
+        place.update(fields)
+        self._index_location(place)
+        with profiler.stage("emit"):
+            self.update_fields.emit(place["feature_id"], fields)
 
-    async def fetch_and_process_additional_info(self, places, client):
+    def _enrichment_options(self):
         parse_category = self.options.get("category", False)
         parse_lat_long = self.options.get("lat_long", False)
-        
-        needs_feature_data = parse_category or parse_lat_long
-        if needs_feature_data:
-            await self._fetch_feature_details(places, client, parse_category, parse_lat_long)
+        url_options = [opt for opt in CHECKBOX_OPTIONS if self.options.get(opt, False) and CHECKBOX_OPTIONS[opt].get("req", False)]
+        return parse_category, parse_lat_long, url_options
 
-        needs_url_data = any(self.options.get(opt, False) for opt in CHECKBOX_OPTIONS if CHECKBOX_OPTIONS[opt].get("req", False))
-        if needs_url_data:
-            await self._fetch_url_based_details(places)
+    def _index_location(self, place):
+        lat_long = place.get("lat_long")
+        if lat_long:
+            key = self._spatial_keys.setdefault(place["feature_id"], len(self._spatial_keys))
+            self.spatial_index.add(key, lat_long[0], lat_long[1])
 
-    async def _fetch_feature_details(self, places, client, parse_category, parse_lat_long):
-        batch_size = 50
-        for i in range(0, len(places), batch_size):
+    async def fetch_and_process_additional_info(self, places, client):
+        parse_category, parse_lat_long, url_options = self._enrichment_options()
+        if not (parse_category or parse_lat_long or url_options):
+            return
+
+        results = await asyncio.gather(
+            *[
+                self._enrich_place(
+                    place, client, parse_category, parse_lat_long, url_options,
+                    self.limits.feature_semaphore, self.limits.url_semaphore
+                )
+                for place in places
+            ],
+            return_exceptions=True
+        )
+        for place, result in zip(places, results):
+            if isinstance(result, Exception):
+                logger.error("Error enriching %s: %s", place.get('feature_id'), result)
+
+    async def _enrich_place(self, place, client, parse_category, parse_lat_long, url_options, feature_semaphore, url_semaphore):
+        tasks = []
+        if parse_category or parse_lat_long:
+            tasks.append(self._fetch_feature_details(place, client, parse_category, parse_lat_long, feature_semaphore))
+        if url_options and place.get("url"):
+            tasks.append(self._fetch_url_based_details(place, url_options, url_semaphore))
+        await asyncio.gather(*tasks)
+        self._pending_places.pop(place["feature_id"], None)
+
+    async def _fetch_feature_details(self, place, client, parse_category, parse_lat_long, semaphore):
+        async with semaphore:
             if self._stop_event.is_set():
                 return
-            
-            current_batch = places[i:i + batch_size]
-            feature_tasks = [client.fetch_category_data(place.get("feature_id")) for place in current_batch]
-            results = await asyncio.gather(*feature_tasks, return_exceptions=True)
-            
-            for place, html_content in zip(current_batch, results):
-                if self._stop_event.is_set():
-                    return
-                if isinstance(html_content, str):
-                    if parse_category:
-                        place['category'] = client.parse_category_html(html_content)
-                    if parse_lat_long:
-                        place['lat_long'] = client.parse_lat_long_html(html_content)
-                elif isinstance(html_content, Exception):
-                    logger.error(f"Error fetching feature data for {place.get('feature_id')}: {html_content}")
-
-    async def _fetch_url_based_details(self, places):
-        places_with_url = [p for p in places if p.get("url")]
-        if not places_with_url:
+            try:
+                body = await client.fetch_category_data(place.get("feature_id"), raw=True, raise_errors=True)
+            except Exception as e:
+                logger.error("Error fetching feature data for %s: %s", place.get('feature_id'), e)
+                self.dead_letters.record(ENTITY, place, e)
+                return
+        if body is None or self._stop_event.is_set():
+            return
+
+        content, encoding = body
+        try:
+            async with profiler.stage("html_parse"):
+                fields = await self.parse_executor.submit(
+                    page_parsers.parse_entity_page, content, encoding, parse_category, parse_lat_long, size=len(content)
+                )
+        except Exception as e:
+            logger.error("Error parsing feature data for %s: %s", place.get('feature_id'), e)
+            self.dead_letters.record(ENTITY, place, e, reason="parse_error")
             return
+        self.dead_letters.resolve(ENTITY, place["feature_id"])
+        self._deliver_fields(place, fields)
 
-        batch_size = 30
-        for i in range(0, len(places_with_url), batch_size):
+    async def _fetch_url_based_details(self, place, url_options, semaphore):
+        async with semaphore:
             if self._stop_event.is_set():
                 return
+            try:
+                body, _ = await fetch_utils.fetch_url(
+                    self.session, place.get("url"), place.get("feature_id"), raw=True, raise_errors=True
+                )
+            except Exception as e:
+                logger.error("Error fetching URL %s for %s: %s", place.get('url'), place.get('feature_id'), e)
+                self.dead_letters.record(WEBSITE, place, e)
+                return
+        if not body or self._stop_event.is_set():
+            return
 
-            current_batch = places_with_url[i:i + batch_size]
-            url_fetch_tasks = [
-                fetch_utils.fetch_url(self.session, place.get("url"), place.get("feature_id")) 
-                for place in current_batch
-            ]
-            page_content_results = await asyncio.gather(*url_fetch_tasks, return_exceptions=True)
-
-            for place, result in zip(current_batch, page_content_results):
-                if self._stop_event.is_set():
-                    return
-                
-                if isinstance(result, tuple) and len(result) == 2 and result[0]:
-                    page_content = result[0]
-                    for option_key in CHECKBOX_OPTIONS:
-                        if self.options.get(option_key, False) and CHECKBOX_OPTIONS[option_key].get("req", False):
-                            try:
-                                extractor_class = CHECKBOX_OPTIONS[option_key]["extractor"]
-                                extracted_data = extractor_class.extract(page_content)
-                                place[option_key] = extracted_data
-                            except Exception as e:
-                                logger.error(f"Error extracting {option_key} for {place.get('feature_id')}: {e}")
-                elif isinstance(result, Exception):
-                     logger.error(f"Error fetching URL {place.get('url')} for {place.get('feature_id')}: {result}")
-
+        content, encoding, site_url = body
+        link_limit = self.contact_crawler.max_pages if self.contact_crawler is not None else 0
+        try:
+            async with profiler.stage("extraction"):
+                fields, errors, links = await self.parse_executor.submit(
+                    page_parsers.extract_website_fields, content, encoding, url_options,
+                    site_url, link_limit, size=len(content)
+                )
+        except Exception as e:
+            logger.error("Error extracting website data for %s: %s", place.get('feature_id'), e)
+            self.dead_letters.record(WEBSITE, place, e, reason="parse_error")
+            return
+        for option_key, error in errors:
+            logger.error("Error extracting %s for %s: %s", option_key, place.get('feature_id'), error)
+        self.dead_letters.resolve(WEBSITE, place["feature_id"])
+        self._deliver_fields(place, fields)
+
+        if links and not self._stop_event.is_set():
+            extra_fields = await self.contact_crawler.crawl(
+                site_url, links, fields, url_options, lambda url, keys: self._fetch_contact_page(place, url, keys, semaphore)
+            )
+            self._deliver_fields(place, extra_fields)
+
+    async def _fetch_contact_page(self, place, url, option_keys, semaphore):
+        async with semaphore:
+            if self._stop_event.is_set():
+                return {}
+            body, _ = await fetch_utils.fetch_url(self.session, url, place.get("feature_id"), raw=True, raise_errors=True)
+        content, encoding, _ = body
+        async with profiler.stage("extraction"):
+            fields, _, _ = await self.parse_executor.submit(
+                page_parsers.extract_website_fields, content, encoding, option_keys, size=len(content)
+            )
+        return fields
+
+    async def retry_dead_letters(self, concurrency=10):
+        entries = [entry for entry in self.dead_letters if entry["attempts"] < self.max_retry_attempts]
+        if not entries:
+            return
+        parse_category, parse_lat_long, url_options = self._enrichment_options()
+        client = GoogleEarthClient("", self.session)
+        semaphore = asyncio.Semaphore(concurrency)
+        failed_before = len(self.dead_letters)
+        logger.info("Retrying %d failed fetches.", len(entries))
+        if getattr(self.session, "dns_cache", None) is not None:
+            forgotten = self.session.dns_cache.forget_failures()
+            if forgotten:
+                logger.info("Cleared %d failed DNS lookups before the retry pass.", forgotten)
+
+        tasks = []
+        for entry in entries:
+            place = {"feature_id": entry["feature_id"], "url": entry.get("url")}
+            if entry["kind"] == ENTITY and (parse_category or parse_lat_long):
+                tasks.append(self._fetch_feature_details(place, client, parse_category, parse_lat_long, semaphore))
+            elif entry["kind"] == WEBSITE and url_options and place["url"]:
+                tasks.append(self._fetch_url_based_details(place, url_options, semaphore))
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Retry pass recovered %d of %d failed fetches.", failed_before - len(self.dead_letters), len(entries))
 
     def stop(self):
         logger.info("Stop requested for scraper worker.")
+        self._stop_requested_at = time.perf_counter()
         self._stop_event.set()
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._cancel_worker_tasks)
+
+    def _cancel_worker_tasks(self):
+        for task in [*self._worker_tasks, *self._enrichment_tasks]:
+            task.cancel()
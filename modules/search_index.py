@@ -0,0 +1,103 @@
+import math
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from modules.dedup import normalize_text
+
+TEXT_FIELDS = ("title", "address", "category", "mail")
+NUMERIC_FIELDS = ("rating_score", "review_count")
+
+def tokenize(value):
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        value = " ".join(map(str, value))
+    return normalize_text(str(value)).split()
+
+def field_tokens(place):
+    tokens = set()
+    for field in TEXT_FIELDS:
+        tokens.update(tokenize(place.get(field)))
+    return tokens
+
+
+class SearchIndex:
+    def __init__(self):
+        self.postings = defaultdict(lambda: array('q'))
+        self.field_tokens = {field: [] for field in TEXT_FIELDS}
+        self.numbers = {field: array('d') for field in NUMERIC_FIELDS}
+        self.size = 0
+        self._vocabulary = None
+
+    def _grow(self, row):
+        missing = row + 1 - self.size
+        if missing <= 0:
+            return
+        for values in self.numbers.values():
+            values.extend([math.nan] * missing)
+        for tokens in self.field_tokens.values():
+            tokens.extend([()] * missing)
+        self.size = row + 1
+
+    def row_tokens(self, row):
+        if row >= self.size:
+            return set()
+        return set().union(*(tokens[row] for tokens in self.field_tokens.values()))
+
+    def add(self, row, place):
+        self._grow(row)
+        for field in NUMERIC_FIELDS:
+            if field in place:
+                try:
+                    self.numbers[field][row] = float(place[field]) if place[field] is not None else math.nan
+                except (TypeError, ValueError):
+                    self.numbers[field][row] = math.nan
+
+        changed_fields = [field for field in TEXT_FIELDS if field in place]
+        if not changed_fields:
+            return
+        old_tokens = self.row_tokens(row)
+        for field in changed_fields:
+            self.field_tokens[field][row] = tuple({sys.intern(token) for token in tokenize(place[field])})
+        new_tokens = self.row_tokens(row)
+
+        for token in old_tokens - new_tokens:
+            postings = self.postings[token]
+            postings.remove(row)
+            if not postings:
+                del self.postings[token]
+                self._vocabulary = None
+        for token in new_tokens - old_tokens:
+            if token not in self.postings:
+                self._vocabulary = None
+            self.postings[token].append(row)
+
+    def _tokens_with_prefix(self, prefix):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect_left(self._vocabulary, prefix)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                return
+            yield token
+
+    def search(self, terms):
+        result = None
+        for term in sorted(terms, key=len, reverse=True):
+            rows = set()
+            for token in self._tokens_with_prefix(term):
+                rows.update(self.postings[token])
+            result = rows if result is None else result & rows
+            if not result:
+                return []
+        return sorted(result) if result is not None else []
+
+    @staticmethod
+    def matches(place, terms):
+        tokens = field_tokens(place)
+        return all(any(token.startswith(term) for token in tokens) for term in terms)
+
+    def number(self, field, row):
+        value = self.numbers[field][row] if row < self.size else math.nan
+        return -math.inf if math.isnan(value) else value
@@ -0,0 +1,167 @@
+import json
+import math
+import os
+from array import array
+from collections import defaultdict
+from modules.geo_tiles import distance_meters, EARTH_RADIUS_METERS
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_METERS / 180
+
+def point_in_polygon(latitude, longitude, polygon):
+    inside = False
+    previous_lat, previous_lng = polygon[-1]
+    for lat, lng in polygon:
+        if (lat > latitude) != (previous_lat > latitude):
+            crossing = lng + (latitude - lat) * (previous_lng - lng) / (previous_lat - lat)
+            if longitude < crossing:
+                inside = not inside
+        previous_lat, previous_lng = lat, lng
+    return inside
+
+def load_polygon(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        text = file.read()
+    if os.path.splitext(path)[1].lower() in (".json", ".geojson"):
+        geometry = json.loads(text)
+        if geometry.get("type") == "FeatureCollection":
+            geometry = geometry["features"][0]
+        if geometry.get("type") == "Feature":
+            geometry = geometry["geometry"]
+        rings = geometry["coordinates"][0] if geometry["type"] == "Polygon" else geometry["coordinates"][0][0]
+        return [(float(lat), float(lng)) for lng, lat in (point[:2] for point in rings)]
+    points = []
+    for line in text.splitlines():
+        if line.strip():
+            lat, lng = (float(part) for part in line.replace(";", ",").split(",")[:2])
+            points.append((lat, lng))
+    return points
+
+def parse_area(text):
+    text = text.strip()
+    if os.path.isfile(text):
+        polygon = load_polygon(text)
+        if len(polygon) < 3:
+            raise ValueError(f"Polygon in {text} needs at least three points.")
+        return ("polygon", polygon)
+    try:
+        values = [float(part) for part in text.split(",")]
+    except ValueError:
+        raise ValueError(f"Area must be lat,lng,meters, south,west,north,east or a polygon file: {text}") from None
+    if len(values) == 3:
+        return ("radius", tuple(values))
+    if len(values) == 4:
+        return ("bbox", tuple(values))
+    raise ValueError(f"Area must be lat,lng,meters, south,west,north,east or a polygon file: {text}")
+
+def area_contains(area, latitude, longitude):
+    kind, value = area
+    if kind == "radius":
+        return distance_meters(value[:2], (latitude, longitude)) <= value[2]
+    if kind == "bbox":
+        south, west, north, east = value
+        return south <= latitude <= north and west <= longitude <= east
+    return point_in_polygon(latitude, longitude, value)
+
+
+class SpatialIndex:
+    def __init__(self, precision=6):
+        lat_bits = 5 * precision // 2
+        lng_bits = 5 * precision - lat_bits
+        self.cell_height = 180 / 2 ** lat_bits
+        self.cell_width = 360 / 2 ** lng_bits
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        self.cells = defaultdict(lambda: array('q'))
+        self.size = 0
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        index = cls(**kwargs)
+        for row, place in enumerate(store):
+            lat_long = place.get("lat_long")
+            if lat_long:
+                index.add(row, lat_long[0], lat_long[1])
+        logger.info("Spatial index built with %d of %d places.", index.size, len(store))
+        return index
+
+    def _cell(self, latitude, longitude):
+        return int((latitude + 90) // self.cell_height), int((longitude + 180) // self.cell_width)
+
+    def add(self, key, latitude, longitude):
+        latitude, longitude = float(latitude), float(longitude)
+        missing = key + 1 - len(self.latitudes)
+        if missing > 0:
+            self.latitudes.extend([math.nan] * missing)
+            self.longitudes.extend([math.nan] * missing)
+        old_latitude, old_longitude = self.latitudes[key], self.longitudes[key]
+        if not math.isnan(old_latitude):
+            if (old_latitude, old_longitude) == (latitude, longitude):
+                return
+            self.cells[self._cell(old_latitude, old_longitude)].remove(key)
+            self.size -= 1
+        self.latitudes[key] = latitude
+        self.longitudes[key] = longitude
+        self.cells[self._cell(latitude, longitude)].append(key)
+        self.size += 1
+
+    def _candidate_cells(self, south, west, north, east):
+        first_row, first_col = self._cell(south, west)
+        last_row, last_col = self._cell(north, east)
+        if (last_row - first_row + 1) * (last_col - first_col + 1) <= len(self.cells):
+            for row in range(first_row, last_row + 1):
+                for col in range(first_col, last_col + 1):
+                    if (row, col) in self.cells:
+                        yield (row, col), self.cells[(row, col)]
+        else:
+            for cell, keys in self.cells.items():
+                if first_row <= cell[0] <= last_row and first_col <= cell[1] <= last_col:
+                    yield cell, keys
+
+    def bbox(self, south, west, north, east):
+        result = []
+        latitudes, longitudes = self.latitudes, self.longitudes
+        for (row, col), keys in self._candidate_cells(south, west, north, east):
+            cell_south = row * self.cell_height - 90
+            cell_west = col * self.cell_width - 180
+            if (south <= cell_south and cell_south + self.cell_height <= north
+                    and west <= cell_west and cell_west + self.cell_width <= east):
+                result.extend(keys)
+                continue
+            result.extend(
+                key for key in keys
+                if south <= latitudes[key] <= north and west <= longitudes[key] <= east
+            )
+        return result
+
+    def radius(self, latitude, longitude, meters):
+        lat_delta = meters / METERS_PER_DEGREE
+        lng_delta = meters / (METERS_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+        center = (latitude, longitude)
+        return [
+            key for key in self.bbox(latitude - lat_delta, longitude - lng_delta, latitude + lat_delta, longitude + lng_delta)
+            if distance_meters(center, (self.latitudes[key], self.longitudes[key])) <= meters
+        ]
+
+    def polygon(self, points):
+        latitudes = [point[0] for point in points]
+        longitudes = [point[1] for point in points]
+        return [
+            key for key in self.bbox(min(latitudes), min(longitudes), max(latitudes), max(longitudes))
+            if point_in_polygon(self.latitudes[key], self.longitudes[key], points)
+        ]
+
+    def select(self, area):
+        kind, value = area
+        if kind == "radius":
+            keys = self.radius(*value)
+        elif kind == "bbox":
+            keys = self.bbox(*value)
+        else:
+            keys = self.polygon(value)
+        return sorted(keys)
+
+    def count_in_tile(self, tile):
+        return len(self.bbox(tile.south, tile.west, tile.north, tile.east))
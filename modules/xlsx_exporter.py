@@ -1,4 +1,5 @@
 import openpyxl
+from itertools import chain
 from openpyxl.styles import Font, PatternFill
 from modules.exporter import Exporter
 from modules.logger import get_logger
@@ -7,7 +8,9 @@ logger = get_logger(__name__)
 
 class ExcelExporter(Exporter):
     def export(self, data, file_path):
-        if not data:
+        rows = iter(data)
+        first_row = next(rows, None)
+        if first_row is None:
             logger.warning("No data provided for export. Excel file was not created.")
             return
 
@@ -15,8 +18,8 @@ class ExcelExporter(Exporter):
             workbook = openpyxl.Workbook()
             sheet = workbook.active
 
-            headers = data[0].keys()
-            sheet.append(list(headers))
+            headers = list(first_row.keys())
+            sheet.append(headers)
 
             header_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
             header_font = Font(bold=True)
@@ -26,20 +29,19 @@ class ExcelExporter(Exporter):
                 cell.fill = header_fill
                 cell.font = header_font
 
-            for row_data in data:
+            max_lengths = [len(header) for header in headers]
+            for row_data in chain([first_row], rows):
                 sheet.append(list(row_data.values()))
+                for col_num, header in enumerate(headers):
+                    max_lengths[col_num] = max(max_lengths[col_num], len(str(row_data[header])))
 
-            for col_num, header in enumerate(headers, 1):
+            for col_num, max_length in enumerate(max_lengths, 1):
                 column_letter = openpyxl.utils.get_column_letter(col_num)
-                max_length = len(header)
-                for row in data:
-                    cell_value = str(row[header])
-                    max_length = max(max_length, len(cell_value))
-
                 sheet.column_dimensions[column_letter].width = max_length + 2
 
             sheet.auto_filter.ref = sheet.dimensions
             workbook.save(file_path)
-            logger.info(f"Data successfully exported to Excel at {file_path}.")
+            logger.info("Data successfully exported to Excel at %s.", file_path)
         except Exception as e:
-            logger.error(f"Failed to export data to Excel at {file_path}: {e}", exc_info=True)
+            logger.error("Failed to export data to Excel at %s: %s", file_path, e, exc_info=True)
+            raise
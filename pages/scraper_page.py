@@ -3,14 +3,14 @@ import os
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QFileDialog,
-    QTableWidget, QHeaderView, QMessageBox,
-    QComboBox, QTableWidgetItem
+    QTableView, QHeaderView, QMessageBox,
+    QComboBox, QAbstractItemView, QLineEdit
 )
 from PySide6.QtCore import Qt, QTimer
-from modules.scraper import ScraperWorker
-from modules.json_exporter import JsonExporter
-from modules.csv_exporter import CsvExporter
-from modules.xlsx_exporter import ExcelExporter
+from modules.exporter import EXPORTERS, FLAT_FORMATS, ExportRows, get_exporter
+from modules.result_store import ResultStore, StoreSelection
+from modules.spatial_index import parse_area
+from components.result_table_model import ResultTableModel
 from utils.constants import CHECKBOX_OPTIONS
 from modules.logger import get_logger
 
@@ -26,6 +26,7 @@ class ScraperPage(QWidget):
 
         logger.info("Initializing ScraperPage UI components.")
         self.init_ui()
+        self.update_headers()
         self.timer = QTimer()
         self.elapsed_time = 0
         self.timer.timeout.connect(self.update_time)
@@ -34,6 +35,8 @@ class ScraperPage(QWidget):
         logger.info("Setting up UI layouts.")
         self.setup_layouts()
         self.setup_buttons()
+        self.setup_search_filter()
+        self.setup_area_filter()
         self.setup_results_table()
         self.setup_timer_label()
         self.setup_total_data_label()
@@ -76,10 +79,41 @@ class ScraperPage(QWidget):
         button.clicked.connect(callback)
         self.top_layout.addWidget(button)
 
+    def setup_search_filter(self):
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Ara: başlık, adres, kategori, e-posta")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.apply_search_filter)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.table_layout.addWidget(self.search_input)
+
+    def apply_search_filter(self):
+        self.results_model.set_search(self.search_input.text())
+        self.update_total_count()
+
+    def setup_area_filter(self):
+        self.area_filter_input = QLineEdit()
+        self.area_filter_input.setPlaceholderText("Konum filtresi: enlem,boylam,metre | güney,batı,kuzey,doğu | polygon dosyası")
+        self.area_filter_input.returnPressed.connect(self.apply_area_filter)
+        self.table_layout.addWidget(self.area_filter_input)
+
+    def apply_area_filter(self):
+        text = self.area_filter_input.text().strip()
+        try:
+            area = parse_area(text) if text else None
+        except (ValueError, OSError) as e:
+            logger.warning("Invalid area filter: %s", e)
+            QMessageBox.warning(self, "Uyarı", f"Konum filtresi hatalı: {e}")
+            return
+        self.results_model.set_area(area)
+        self.update_total_count()
+
     def setup_export_section(self):
         self.export_layout = QHBoxLayout()        
         self.export_format_combo = QComboBox()
-        self.export_format_combo.addItems(["JSON", "CSV", "XLSX"])
+        self.export_format_combo.addItems(list(EXPORTERS))
         export_button = QPushButton("Dışa Aktar")
         export_button.clicked.connect(self.export_data)
         self.export_layout.addWidget(self.export_format_combo)
@@ -88,10 +122,15 @@ class ScraperPage(QWidget):
         self.export_layout.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignBottom)
 
     def setup_results_table(self):
-        self.results_table = QTableWidget()
+        self.result_store = ResultStore()
+        self.results_model = ResultTableModel(self.result_store, self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.update_results_table()
+        self.results_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.results_table.setSortingEnabled(True)
         self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.results_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table_layout.addWidget(self.results_table)
 
     def setup_timer_label(self):
@@ -110,8 +149,7 @@ class ScraperPage(QWidget):
         self.update_results_table()
 
     def update_results_table(self):
-        self.results_table.setColumnCount(len(self.data_keys))
-        self.results_table.setHorizontalHeaderLabels(list(self.data_keys.keys()))
+        self.results_model.set_columns(self.data_keys)
 
     def start_scraping(self):
         if hasattr(self, 'worker') and self.worker.isRunning():
@@ -119,21 +157,58 @@ class ScraperPage(QWidget):
             QMessageBox.warning(self, "Uyarı", "Scraping işlemi zaten çalışıyor.")
             return
 
-        queries = self.settings_page.get_queries()
-        if queries:
+        queries = self.settings_page.get_query_source()
+        try:
+            query_count = queries.count()
+        except (OSError, ValueError) as e:
+            logger.warning("Invalid query file: %s", e)
+            QMessageBox.warning(self, "Uyarı", f"Sorgu dosyası okunamadı: {e}")
+            return
+        if query_count:
+            try:
+                bounding_box = self.settings_page.get_bounding_box()
+            except ValueError as e:
+                logger.warning("Invalid bounding box: %s", e)
+                QMessageBox.warning(self, "Uyarı", f"Bölge hatalı: {e}")
+                return
+            try:
+                place_filter = self.settings_page.get_place_filter()
+            except ValueError as e:
+                logger.warning("Invalid filter: %s", e)
+                QMessageBox.warning(self, "Uyarı", str(e))
+                return
+            try:
+                contact_pages = self.settings_page.get_contact_pages()
+            except ValueError as e:
+                logger.warning("Invalid contact page count: %s", e)
+                QMessageBox.warning(self, "Uyarı", str(e))
+                return
+
             self.update_headers()
             selected_options = self.settings_page.get_selected_options()
 
             logger.info("Starting scraping process.")
-            self.results_table.setRowCount(0)
+            self.results_model.clear()
 
             start_button = self.findChild(QPushButton, "Başlat")
             if start_button:
                 start_button.setEnabled(False)
 
-            self.worker = ScraperWorker(queries=queries, options=selected_options, max_concurrent_requests=5)
+            from modules.scraper import ScraperWorker
+
+            self.worker = ScraperWorker(
+                queries=queries,
+                options=selected_options,
+                max_concurrent_requests=5,
+                client_options={"proxy_pool": self.settings_page.get_proxy_pool()},
+                bounding_box=bounding_box,
+                place_filter=place_filter,
+                contact_pages=contact_pages
+            )
             self.worker.update_data.connect(self.add_row_to_table)
+            self.worker.update_fields.connect(self.results_model.update_fields)
             self.worker.finished.connect(self.finish_scraping)
+            self.worker.stopped.connect(self.on_scraping_stopped)
             self.timer.start(1000)
             self.elapsed_time = 0
             self.worker.start()
@@ -142,15 +217,19 @@ class ScraperPage(QWidget):
             QMessageBox.warning(self, "Uyarı", "En az 1 adet sorgu girmeniz gerek.")
 
     def stop_scraping(self):
-        if hasattr(self, 'worker'):
+        if hasattr(self, 'worker') and self.worker.isRunning():
             self.worker.stop()
-            self.worker.terminate()
-            logger.info("Scraping process stopped.")
+            logger.info("Stop requested, waiting for in-flight requests to be cancelled.")
         self.timer.stop()
-        
-        start_button = self.findChild(QPushButton, "Başlat")
-        if start_button:
-            start_button.setEnabled(True)
+
+    def on_scraping_stopped(self, summary):
+        logger.info("Scraping process stopped: %s", summary)
+        QMessageBox.information(
+            self,
+            "Bilgi",
+            f"Scraping durduruldu. {summary['incomplete_places']} kaydın ek bilgileri tamamlanmadı, "
+            f"{summary['pending_searches']} arama yarım kaldı."
+        )
 
     def finish_scraping(self):
         logger.info("Scraping process finished.")
@@ -169,62 +248,39 @@ class ScraperPage(QWidget):
         self.time_label.setText(f"Geçen Süre: {hours:02}:{minutes:02}:{seconds:02}")
 
     def update_total_count(self):
-        total_rows = self.results_table.rowCount()
-        self.total_data_label.setText(f"Toplam Veri: {total_rows}")
+        total_rows = len(self.result_store)
+        if not self.results_model.is_filtered():
+            self.total_data_label.setText(f"Toplam Veri: {total_rows}")
+        else:
+            self.total_data_label.setText(f"Toplam Veri: {total_rows} (filtrelenen: {self.results_model.rowCount()})")
 
     def add_row_to_table(self, place):
-        logger.debug(f"Adding place data: {place}")
-        row_position = self.results_table.rowCount()
-        self.results_table.insertRow(row_position)
-
-        for col, header in enumerate(self.data_keys.keys()):
-            key = self.data_keys[header]
-            value = place.get(key, "") or ""
-
-            if isinstance(value, list):
-                value = ", ".join(map(str, value))
-            elif isinstance(value, (int, float)):
-                value = str(value)
-
-            self.results_table.setItem(row_position, col, QTableWidgetItem(str(value)))
-
+        logger.debug("Adding place %s to results table.", place.get("feature_id"))
+        self.results_model.add_place(place)
         self.update_total_count()
 
     def export_data(self):
         selected_format = self.export_format_combo.currentText()
-        logger.info(f"Exporting data in {selected_format} format.")
+        logger.info("Exporting data in %s format.", selected_format)
         file_dialog = QFileDialog.getSaveFileName(self, "Kaydetme Yeri Seçin", "", f"{selected_format} Files (*.{selected_format.lower()});;All Files (*)")
         file_path = file_dialog[0]
 
         if file_path:
-            logger.info(f"File path selected for export: {file_path}.")
-            data = []
+            logger.info("File path selected for export: %s.", file_path)
+            self.result_store.flush()
             selected_options = self.settings_page.get_selected_options()
-            for row in range(self.results_table.rowCount()):
-                row_data = {}
-                for col, header in enumerate(self.data_keys.keys()):
-                    key = self.data_keys[header]
-                    if key in selected_options:
-                        cell_item = self.results_table.item(row, col)
-                        value = cell_item.text() if cell_item else ""
-
-                        if key == 'rating_score':
-                            row_data[key] = float(value) if value else 0.0
-                        elif key == 'review_count':
-                            row_data[key] = int(value) if value else 0
-                        else:
-                            row_data[key] = value
-                
-                data.append(row_data)
-
-            if selected_format == "JSON":
-                exporter = JsonExporter()
-            elif selected_format == "CSV":
-                exporter = CsvExporter()
-            elif selected_format == "XLSX":
-                exporter = ExcelExporter()
-            
-            exporter.export(data, file_path)
+            keys = [key for key in self.data_keys.values() if selected_options.get(key)]
+            places = self.result_store
+            visible_rows = self.results_model.visible_rows
+            if visible_rows is not None:
+                places = StoreSelection(self.result_store, visible_rows)
+            data = ExportRows(places, keys, flatten=selected_format in FLAT_FORMATS)
+
+            exporter = get_exporter(selected_format)
+            try:
+                exporter.export(data, file_path)
+            except Exception as e:
+                QMessageBox.warning(self, "Uyarı", f"Dışa aktarma başarısız oldu: {e}")
         else:
             logger.warning("No file path selected for export.")
             QMessageBox.warning(self, "Uyarı", "Dosya seçilmedi.")
@@ -3,10 +3,14 @@ import os
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QFileDialog,
     QPushButton, QListWidget, QLineEdit, QCheckBox, QMessageBox,
-    QAbstractItemView, QListWidgetItem
+    QAbstractItemView, QLabel
 )
 from PySide6.QtCore import Qt, Signal
 from utils.constants import CHECKBOX_OPTIONS
+from modules.geo_tiles import GeoTile
+from modules.filters import PlaceFilter
+from modules.query_source import QuerySource, ListQuerySource, ChainedQuerySource
+from utils.proxy_pool import ProxyPool
 from modules.logger import get_logger
 
 logger = get_logger(__name__)
@@ -16,6 +20,8 @@ class SettingsPage(QWidget):
     
     def __init__(self):
         super().__init__()
+        self.proxy_urls = []
+        self.query_file_source = None
         self.init_ui()
 
     def init_ui(self):
@@ -24,6 +30,7 @@ class SettingsPage(QWidget):
         self.checkboxes = {key: QCheckBox(value["description"]) for key, value in CHECKBOX_OPTIONS.items()}
 
         self.setup_options_layout()
+        self.setup_filter_layout()
         self.setup_query_input_and_list()
         self.setup_buttons()
     
@@ -38,6 +45,25 @@ class SettingsPage(QWidget):
         if option_layout.count():
             self.layout.addLayout(option_layout)
 
+    def setup_filter_layout(self):
+        filter_layout = QHBoxLayout()
+        self.min_rating_input = QLineEdit()
+        self.min_rating_input.setPlaceholderText("En düşük puan")
+        self.min_reviews_input = QLineEdit()
+        self.min_reviews_input.setPlaceholderText("En az yorum sayısı")
+        self.title_pattern_input = QLineEdit()
+        self.title_pattern_input.setPlaceholderText("İsim filtresi (regex)")
+        self.address_pattern_input = QLineEdit()
+        self.address_pattern_input.setPlaceholderText("Adres filtresi (regex)")
+        self.require_url_checkbox = QCheckBox("Web sitesi olanlar")
+        self.require_phone_checkbox = QCheckBox("Telefonu olanlar")
+        for widget in (
+            self.min_rating_input, self.min_reviews_input, self.title_pattern_input,
+            self.address_pattern_input, self.require_url_checkbox, self.require_phone_checkbox,
+        ):
+            filter_layout.addWidget(widget)
+        self.layout.addLayout(filter_layout)
+
     def setup_query_input_and_list(self):
         left_layout = QVBoxLayout()
         self.query_input = QLineEdit()
@@ -51,6 +77,27 @@ class SettingsPage(QWidget):
         self.query_list_widget.itemDoubleClicked.connect(self.edit_query)
         left_layout.addWidget(self.query_list_widget)
 
+        self.query_template_input = QLineEdit()
+        self.query_template_input.setPlaceholderText("CSV şablonu, ör. {category} in {city} - isteğe bağlı")
+        self.query_template_input.setFixedWidth(300)
+        left_layout.addWidget(self.query_template_input)
+
+        self.query_file_label = QLabel()
+        self.query_file_label.setFixedWidth(300)
+        self.query_file_label.setWordWrap(True)
+        self.query_file_label.hide()
+        left_layout.addWidget(self.query_file_label)
+
+        self.bounding_box_input = QLineEdit()
+        self.bounding_box_input.setPlaceholderText("Bölge (güney,batı,kuzey,doğu) - isteğe bağlı")
+        self.bounding_box_input.setFixedWidth(300)
+        left_layout.addWidget(self.bounding_box_input)
+
+        self.contact_pages_input = QLineEdit()
+        self.contact_pages_input.setPlaceholderText("Site başına ek iletişim sayfası (ör. 3) - isteğe bağlı")
+        self.contact_pages_input.setFixedWidth(300)
+        left_layout.addWidget(self.contact_pages_input)
+
         self.layout.addLayout(left_layout)
 
     def setup_buttons(self):
@@ -60,12 +107,13 @@ class SettingsPage(QWidget):
             ("Seçilenleri Sil", self.remove_selected_queries),
             ("Tümünü Sil", self.remove_all_queries),
             ("Dosyadan Yükle", self.load_queries_from_file),
+            ("Proxy Listesi Yükle", self.load_proxies_from_file),
         ]
         for text, callback in buttons:
             self.create_button(text, callback)
         
     def create_button(self, text, callback):
-        logger.debug(f"Creating button: {text}.")
+        logger.debug("Creating button: %s.", text)
         button = QPushButton(text)
         button.setFixedWidth(300)
         button.clicked.connect(callback)
@@ -93,7 +141,7 @@ class SettingsPage(QWidget):
         if query_text:
             self.query_list_widget.addItem(query_text)
             self.query_input.clear()
-            logger.info(f"Query added: {query_text}.")
+            logger.info("Query added: %s.", query_text)
         else:
             QMessageBox.warning(self, "Uyarı", "Lütfen bir sorgu girin.")
     
@@ -108,29 +156,85 @@ class SettingsPage(QWidget):
 
     def remove_all_queries(self):
         self.query_list_widget.clear()
+        self.query_file_source = None
+        self.query_file_label.hide()
         logger.info("All queries removed.")
     
     def load_queries_from_file(self):
-        file_name, _ = QFileDialog.getOpenFileName(self, "Dosya Seç", "", "Text Dosyaları (*.txt);;Tüm Dosyalar (*)")
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, "Dosya Seç", "", "Sorgu Dosyaları (*.txt *.csv);;Tüm Dosyalar (*)"
+        )
         if file_name:
             try:
-                with open(file_name, 'r', encoding='utf-8') as file:
-                    queries = [line.strip() for line in file if line.strip()]
-                self.query_list_widget.clear()
-                for query in queries:
-                    self.query_list_widget.addItem(QListWidgetItem(query))
-                logger.info(f"Queries loaded from file: {file_name}.")
+                source = QuerySource.from_file(file_name, self.query_template_input.text().strip() or None)
+                count = source.count()
+                preview = source.preview()
+                self.query_file_source = source
+                self.query_file_label.setText(
+                    f"{os.path.basename(file_name)}: {count} sorgu\n" + "\n".join(preview) + ("\n..." if count > len(preview) else "")
+                )
+                self.query_file_label.show()
+                logger.info("%s queries loaded from file: %s.", count, file_name)
             except Exception as e:
                 QMessageBox.warning(self, "Uyarı", f"Dosya yüklenirken bir hata oluştu: {str(e)}")
-                logger.error(f"Error loading queries from file: {e}")
+                logger.error("Error loading queries from file: %s", e)
     
+    def load_proxies_from_file(self):
+        file_name, _ = QFileDialog.getOpenFileName(self, "Proxy Dosyası Seç", "", "Text Dosyaları (*.txt);;Tüm Dosyalar (*)")
+        if file_name:
+            try:
+                self.proxy_urls = [proxy.url for proxy in ProxyPool.from_file(file_name).proxies]
+                logger.info("%s proxies loaded from file: %s.", len(self.proxy_urls), file_name)
+                QMessageBox.information(self, "Bilgi", f"{len(self.proxy_urls)} proxy yüklendi.")
+            except Exception as e:
+                QMessageBox.warning(self, "Uyarı", f"Proxy dosyası yüklenirken bir hata oluştu: {str(e)}")
+                logger.error("Error loading proxies from file: %s", e)
+
+    def get_proxy_pool(self):
+        return ProxyPool(self.proxy_urls) if self.proxy_urls else None
+
     def emit_options_updated(self):
         options = {key: checkbox.isChecked() for key, checkbox in self.checkboxes.items()}
         self.options_updated.emit(options)
-        logger.debug(f"Options updated: {options}")
+        logger.debug("Options updated: %s", options)
 
     def get_queries(self):
         return [self.query_list_widget.item(i).text() for i in range(self.query_list_widget.count())]
 
+    def get_query_source(self):
+        sources = [ListQuerySource(self.get_queries())]
+        if self.query_file_source is not None:
+            sources.append(self.query_file_source)
+        return ChainedQuerySource(sources)
+
+    def get_bounding_box(self):
+        text = self.bounding_box_input.text().strip()
+        if not text:
+            return None
+        return GeoTile.parse(text)
+
+    def get_contact_pages(self):
+        text = self.contact_pages_input.text().strip()
+        if not text:
+            return 0
+        if not text.isdigit():
+            raise ValueError(f"İletişim sayfası sayısı hatalı: {text}")
+        return int(text)
+
+    def get_place_filter(self):
+        min_rating = self.min_rating_input.text().strip().replace(",", ".")
+        min_reviews = self.min_reviews_input.text().strip()
+        try:
+            return PlaceFilter(
+                min_rating=float(min_rating) if min_rating else None,
+                min_reviews=int(min_reviews) if min_reviews else None,
+                require_url=self.require_url_checkbox.isChecked(),
+                require_phone=self.require_phone_checkbox.isChecked(),
+                title_pattern=self.title_pattern_input.text().strip() or None,
+                address_pattern=self.address_pattern_input.text().strip() or None,
+            )
+        except ValueError as e:
+            raise ValueError(f"Filtre hatalı: {e}") from e
+
     def get_selected_options(self):
         return {key: checkbox.isChecked() for key, checkbox in self.checkboxes.items()}
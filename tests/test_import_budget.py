@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("httpx", "httpcore", "bs4", "openpyxl", "pyarrow")
+
+
+def imported_modules(code):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    names = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            names.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return names
+
+
+def assert_no_heavy_imports(code):
+    names = imported_modules(
+        code + "\nimport sys\n"
+        f"loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    assert not names.intersection(HEAVY_MODULES), sorted(names.intersection(HEAVY_MODULES))
+
+
+def test_headless_parses_arguments_without_heavy_imports():
+    assert_no_heavy_imports("import headless\nheadless.parse_args(['-q', 'kafe', '-o', 'out.csv'])")
+
+
+def test_jobs_parses_arguments_without_heavy_imports():
+    assert_no_heavy_imports("import jobs\njobs.parse_args(['jobs.json'])")
+
+
+def test_settings_page_imports_without_heavy_imports():
+    pytest.importorskip("PySide6")
+    assert_no_heavy_imports("import pages.settings_page")
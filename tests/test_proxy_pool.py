@@ -0,0 +1,98 @@
+import asyncio
+import socket
+import pytest
+from utils.proxy_pool import ProxyPool
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_failed_proxy_scores_worse_than_healthy_proxy():
+    pool = ProxyPool(["http://dead:1", "http://healthy:1"], min_samples=3, eject_seconds=0)
+    dead, healthy = pool.proxies
+    for _ in range(3):
+        pool.record(dead, 0.01, False)
+        pool.record(healthy, 0.2, True)
+
+    assert dead.latency is not None
+    assert dead.score > healthy.score
+    assert asyncio.run(pool.acquire()) is healthy
+
+
+def test_unmeasured_proxy_does_not_win_over_healthy_proxy():
+    pool = ProxyPool(["http://new:1", "http://healthy:1"])
+    new, healthy = pool.proxies
+    pool.record(healthy, 0.2, True)
+
+    assert new.score > healthy.score
+
+
+def test_dead_proxy_is_penalised_after_cooldown():
+    pool = ProxyPool(["http://dead:1", "http://healthy:1"], min_samples=3, eject_seconds=0)
+    dead, healthy = pool.proxies
+    pool.record(healthy, 0.2, True)
+    for _ in range(3):
+        pool.record(dead, 0.01, False)
+
+    assert not dead.outcomes
+    assert asyncio.run(pool.acquire()) is healthy
+
+
+async def start_stand_in_proxy(body=b"ok", stall=False):
+    async def handle(reader, writer):
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        length = len(body) + 100 if stall else len(body)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s" % (length, body))
+        await writer.drain()
+        if stall:
+            await asyncio.sleep(1)
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+def test_transport_routes_around_dead_stand_in_proxy():
+    httpx = pytest.importorskip("httpx")
+    from utils.proxy_transport import ProxyPoolTransport
+
+    async def run():
+        server, healthy_url = await start_stand_in_proxy()
+        dead_url = f"http://127.0.0.1:{unused_port()}"
+        pool = ProxyPool([dead_url, healthy_url], min_samples=2, eject_seconds=60)
+        transport = ProxyPoolTransport(pool, httpx.Limits(max_connections=10))
+        responses = 0
+        async with server, httpx.AsyncClient(transport=transport) as client:
+            for _ in range(10):
+                try:
+                    response = await client.get("http://example.test/")
+                    responses += response.status_code == 200
+                except httpx.ConnectError:
+                    pass
+        return pool, responses
+
+    pool, responses = asyncio.run(run())
+    dead, healthy = pool.proxies
+    assert dead.total_failures == dead.total_requests == 1
+    assert healthy.total_requests == responses == 9
+
+
+def test_transport_counts_stalled_response_against_proxy():
+    httpx = pytest.importorskip("httpx")
+    from utils.proxy_transport import ProxyPoolTransport
+
+    async def run():
+        server, stalling_url = await start_stand_in_proxy(stall=True)
+        pool = ProxyPool([stalling_url], min_samples=10)
+        transport = ProxyPoolTransport(pool, httpx.Limits(max_connections=10))
+        async with server, httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(5, read=0.2)) as client:
+            with pytest.raises(httpx.ReadTimeout):
+                await client.get("http://example.test/")
+        return pool
+
+    proxy, = asyncio.run(run()).proxies
+    assert proxy.total_failures == proxy.total_requests == 1
@@ -0,0 +1,103 @@
+import asyncio
+import base64
+import gzip
+import json
+import time
+from collections import defaultdict, deque
+import httpx
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+class CassetteWriter:
+    def __init__(self, path):
+        self.path = path
+        self.started_at = time.perf_counter()
+        self.count = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+    def write(self, request, response, body, elapsed):
+        entry = {
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": [[key, value] for key, value in response.headers.multi_items()],
+            "body": base64.b64encode(body).decode("ascii"),
+            "elapsed": round(elapsed, 4),
+            "offset": round(time.perf_counter() - self.started_at - elapsed, 4),
+        }
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        logger.info("Cassette saved to %s with %s recorded responses.", self.path, self.count)
+
+
+class Cassette:
+    def __init__(self, entries):
+        self.entries = defaultdict(deque)
+        for entry in entries:
+            self.entries[(entry["method"], entry["url"])].append(entry)
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            entries = [json.loads(line) for line in file if line.strip()]
+        logger.info("Loaded %s recorded responses from %s.", len(entries), path)
+        return cls(entries)
+
+    def next_entry(self, method, url):
+        recorded = self.entries.get((method, url))
+        if not recorded:
+            return None
+        if len(recorded) > 1:
+            return recorded.popleft()
+        return recorded[0]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport, writer):
+        self.transport = transport
+        self.writer = writer
+
+    async def handle_async_request(self, request):
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        try:
+            body = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+        self.writer.write(request, response, body, time.perf_counter() - started)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            content=body,
+            request=request,
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
+        self.writer.close()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette, timing_scale=1.0):
+        self.cassette = cassette
+        self.timing_scale = timing_scale
+
+    async def handle_async_request(self, request):
+        entry = self.cassette.next_entry(request.method, str(request.url))
+        if entry is None:
+            raise httpx.ConnectError(f"No recorded response for {request.method} {request.url}", request=request)
+        if self.timing_scale:
+            await asyncio.sleep(entry["elapsed"] * self.timing_scale)
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=base64.b64decode(entry["body"]),
+            request=request,
+        )
@@ -1,4 +1,4 @@
-from utils.fetch_utils import (
+from utils.extractors import (
     EmailExtractor,
     FacebookExtractor,
     InstagramExtractor,
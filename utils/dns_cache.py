@@ -0,0 +1,190 @@
+import asyncio
+import ipaddress
+import socket
+import time
+import httpcore
+import httpx
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+NOT_FOUND_ERRORS = {
+    code for code in (getattr(socket, "EAI_NONAME", None), getattr(socket, "EAI_NODATA", None)) if code is not None
+}
+HTTPCORE_ERRORS = (
+    httpcore.ProxyError, httpcore.UnsupportedProtocol, httpcore.ProtocolError,
+    httpcore.NetworkError, httpcore.TimeoutException,
+)
+
+class DnsCache:
+    def __init__(self, ttl=300, negative_ttl=900, transient_ttl=30):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.transient_ttl = transient_ttl
+        self._entries = {}
+        self._in_flight = {}
+        self._prefetch_tasks = set()
+        self.lookups = 0
+        self.cache_hits = 0
+        self.negative_hits = 0
+        self.lookup_time = 0.0
+
+    @staticmethod
+    def is_ip_address(host):
+        try:
+            ipaddress.ip_address(host)
+            return True
+        except ValueError:
+            return False
+
+    async def resolve(self, host, port):
+        if self.is_ip_address(host):
+            return [host]
+
+        entry = self._entries.get(host)
+        if entry is not None and entry[0] > time.monotonic():
+            if entry[1] is None:
+                self.negative_hits += 1
+                raise httpcore.ConnectError(f"DNS lookup failed for {host} (cached)")
+            self.cache_hits += 1
+            return entry[1]
+
+        future = self._in_flight.get(host)
+        if future is None:
+            future = asyncio.ensure_future(self._lookup(host, port))
+            self._in_flight[host] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(host, None))
+        addresses = await asyncio.shield(future)
+        if addresses is None:
+            raise httpcore.ConnectError(f"DNS lookup failed for {host}")
+        return addresses
+
+    async def _lookup(self, host, port):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self.lookups += 1
+        try:
+            results = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(result[4][0] for result in results))
+            self._entries[host] = (time.monotonic() + self.ttl, addresses)
+        except (socket.gaierror, UnicodeError) as e:
+            logger.debug("DNS lookup for %s failed: %s", host, e)
+            addresses = None
+            not_found = isinstance(e, UnicodeError) or e.errno in NOT_FOUND_ERRORS
+            self._entries[host] = (time.monotonic() + (self.negative_ttl if not_found else self.transient_ttl), None)
+        finally:
+            self.lookup_time += time.perf_counter() - started
+        return addresses
+
+    def forget_failures(self):
+        failed_hosts = [host for host, entry in self._entries.items() if entry[1] is None]
+        for host in failed_hosts:
+            del self._entries[host]
+        return len(failed_hosts)
+
+    def prefetch(self, host, port=443):
+        if not host or self.is_ip_address(host) or host in self._in_flight:
+            return
+        entry = self._entries.get(host)
+        if entry is not None and entry[0] > time.monotonic():
+            return
+        task = asyncio.ensure_future(self.resolve(host, port))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_done)
+
+    def _prefetch_done(self, task):
+        self._prefetch_tasks.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    def log_summary(self, fetch_time=None):
+        share = f", {self.lookup_time / fetch_time:.1%} of website fetch time" if fetch_time else ""
+        logger.info(
+            "DNS cache: %d lookups taking %.2fs, %d cache hits, %d negative hits%s",
+            self.lookups, self.lookup_time, self.cache_hits, self.negative_hits, share
+        )
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self, backend, cache):
+        self.backend = backend
+        self.cache = cache
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        addresses = await self.cache.resolve(host, port)
+        last_error = httpcore.ConnectError(f"No addresses found for {host}")
+        for address in addresses:
+            try:
+                return await self.backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds):
+        await self.backend.sleep(seconds)
+
+
+def transport_error(error):
+    error_class = getattr(httpx, type(error).__name__, None)
+    if not (isinstance(error_class, type) and issubclass(error_class, httpx.TransportError)):
+        error_class = httpx.TransportError
+    return error_class(str(error))
+
+
+class CoreResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream):
+        self.stream = stream
+
+    async def __aiter__(self):
+        try:
+            async for part in self.stream:
+                yield part
+        except HTTPCORE_ERRORS as e:
+            raise transport_error(e) from e
+
+    async def aclose(self):
+        if hasattr(self.stream, "aclose"):
+            await self.stream.aclose()
+
+
+class CachedDnsTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cache, limits, http2=False):
+        self.pool = httpcore.AsyncConnectionPool(
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http2=http2,
+            network_backend=CachingNetworkBackend(httpcore.AnyIOBackend(), cache),
+        )
+
+    async def handle_async_request(self, request):
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            core_response = await self.pool.handle_async_request(core_request)
+        except HTTPCORE_ERRORS as e:
+            raise transport_error(e) from e
+        return httpx.Response(
+            status_code=core_response.status,
+            headers=core_response.headers,
+            stream=CoreResponseStream(core_response.stream),
+            extensions=core_response.extensions,
+        )
+
+    async def aclose(self):
+        await self.pool.aclose()
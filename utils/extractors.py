@@ -0,0 +1,51 @@
+import re
+
+class EmailExtractor:
+    @staticmethod
+    def extract(text):
+        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+        mails = re.findall(email_pattern, text)
+        return list(set(mails))
+
+class InstagramExtractor:
+    @staticmethod
+    def extract(text):
+        instagram_pattern = instagram_pattern = r'(?:(?:http|https):\/\/)?(?:www\.)?(?:instagram\.com|instagr\.am|instagr\.com)\/(?!p\/|direct\/|accounts\/|call\/|explore\/|stories\/|reels\/|about\/|help\/|privacy\/|terms\/|admin\/|oauth\/|p$|direct$|accounts$|call$|explore$|stories$|reels$|about$|help$|privacy$|terms$|admin$|oauth$)([\w\.]{1,30})(?:\/[^\s]*)?'
+        usernames = re.findall(instagram_pattern, text)
+        return list(set(f"https://instagram.com/{username}" for username in usernames))
+
+class FacebookExtractor:
+    @staticmethod
+    def extract(text):
+        facebook_pattern = r'(?:https?:\/\/)?(?:www\.)?(?:mbasic\.facebook|m\.facebook|facebook|fb)\.(?:com|me)\/(?!sharer\/)(?:(?:\w\.)*#!\/)?(?:pages\/)?(?:[\w\-\.]*\/)*(?:profile\.php\?id=\d+|[\w\-]+)(?:[\/#][^\s!"\'<>?@#$%^&*()]+)?'
+        links = re.findall(facebook_pattern, text)
+        return list(set(links))
+
+class YoutubeExtractor:
+    @staticmethod
+    def extract(text):
+        youtube_pattern = r'https?:\/\/(?:www\.)?(?:youtube(?:-nocookie)?\.com\/(?:channel\/[\w-]+|c\/[\w-]+|user\/[\w-]+|@[\w-]+))'
+        links = re.findall(youtube_pattern, text)
+        return list(set(links))
+
+class LinkedinExtractor:
+    @staticmethod
+    def extract(text):
+        linkedin_pattern = r'(?:https?:\/\/)?(?:www\.)?(?:linkedin\.com\/(?:in|pub)\/[\w-]+)'
+        links = re.findall(linkedin_pattern, text)
+        return list(set(links))
+    
+class TwitterExtractor:
+    @staticmethod
+    def extract(text):
+        twitter_pattern = r'(?:https?:\/\/)?(?:www\.)?(?:twitter\.com|x\.com)\/(?:@?[\w-]+)(?=[\/]?|$)'
+        links = re.findall(twitter_pattern, text)
+        return list(set(links))
+    
+class TiktokExtractor:
+    @staticmethod
+    def extract(text):
+        tiktok_pattern = r'(?:https?:\/\/)?(?:www\.)?tiktok\.com\/@?[\w.-]+'
+        links = re.findall(tiktok_pattern, text)
+        return list(set(links))
+    
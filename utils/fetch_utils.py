@@ -1,77 +1,103 @@
 import httpx
 import re
+from importlib.util import find_spec
 from modules.logger import get_logger
+from modules import profiler
 from urllib.parse import urlparse
+from utils.cassette import Cassette, CassetteWriter, RecordingTransport, ReplayTransport
+from utils.transport_stats import TransportStats
+from utils.proxy_transport import ProxyPoolTransport
+from utils.dns_cache import DnsCache, CachedDnsTransport
+from utils.extractors import (
+    EmailExtractor,
+    FacebookExtractor,
+    InstagramExtractor,
+    YoutubeExtractor,
+    LinkedinExtractor,
+    TwitterExtractor,
+    TiktokExtractor
+)
 logger = get_logger(__name__)
 
-def create_client():
-    return httpx.AsyncClient(timeout=20, limits=httpx.Limits(max_connections=100, max_keepalive_connections=20))
+GOOGLE_HOST = "www.google.com"
+GOOGLE_WARM_UP_URL = f"https://{GOOGLE_HOST}/generate_204"
+HTTP2_AVAILABLE = find_spec("h2") is not None
+BROTLI_AVAILABLE = find_spec("brotli") is not None or find_spec("brotlicffi") is not None
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
 
-async def fetch_url(client, url, feature_id):
+GOOGLE_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60)
+WEB_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+def create_client(record_path=None, replay_path=None, replay_timing_scale=1.0, proxy_pool=None):
+    stats = TransportStats(GOOGLE_HOST)
+    if replay_path:
+        logger.info("Replaying HTTP traffic from cassette %s (timing scale %s).", replay_path, replay_timing_scale)
+        transport = ReplayTransport(Cassette.load(replay_path), timing_scale=replay_timing_scale)
+        client = httpx.AsyncClient(timeout=20, transport=transport, event_hooks=stats.event_hooks())
+        client.transport_stats = stats
+        client.dns_cache = None
+        return client
+
+    if not HTTP2_AVAILABLE:
+        logger.warning("h2 package is not installed, Google RPC calls will use HTTP/1.1.")
+    if proxy_pool:
+        logger.info("Distributing traffic over %d proxies.", len(proxy_pool.proxies))
+        dns_cache = None
+        google_transport = ProxyPoolTransport(proxy_pool, GOOGLE_LIMITS, http2=HTTP2_AVAILABLE)
+        web_transport = ProxyPoolTransport(proxy_pool, WEB_LIMITS)
+    else:
+        dns_cache = DnsCache()
+        google_transport = CachedDnsTransport(dns_cache, GOOGLE_LIMITS, http2=HTTP2_AVAILABLE)
+        web_transport = CachedDnsTransport(dns_cache, WEB_LIMITS)
+    if record_path:
+        logger.info("Recording HTTP traffic to cassette %s.", record_path)
+        writer = CassetteWriter(record_path)
+        google_transport = RecordingTransport(google_transport, writer)
+        web_transport = RecordingTransport(web_transport, writer)
+
+    client = httpx.AsyncClient(
+        timeout=20,
+        transport=web_transport,
+        mounts={f"all://{GOOGLE_HOST}": google_transport},
+        event_hooks=stats.event_hooks(),
+    )
+    client.transport_stats = stats
+    client.dns_cache = dns_cache
+    return client
+
+def prefetch_host(client, url):
+    if client.dns_cache is None or not url:
+        return
+    parsed_url = urlparse(url if "://" in url else f"http://{url}")
+    client.dns_cache.prefetch(parsed_url.hostname, parsed_url.port or (443 if parsed_url.scheme == "https" else 80))
+
+async def warm_up_client(client):
+    try:
+        response = await client.get(GOOGLE_WARM_UP_URL, timeout=5)
+        logger.debug("Google connection pool warmed up over %s.", response.http_version)
+    except Exception as e:
+        logger.warning("Connection warm-up failed: %s", e)
+
+async def fetch_url(client, url, feature_id, raw=False, raise_errors=False):
     domain_pattern = re.compile(
         r'^(https?://)?(www\.)?(instagram\.com|instagr\.am|instagr\.com|facebook\.com|fb\.com|fb\.me|youtube\.com|youtu\.be|linkedin\.com|twitter\.com|x\.com|tiktok\.com)(/.*)?$'
     )
-    if domain_pattern.match(url): return url, feature_id
+    if domain_pattern.match(url): return ((url.encode(), "utf-8", url) if raw else url), feature_id
     headers = {
         "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
     }
     try:
-        response = await client.get(url, headers=headers, follow_redirects=True, timeout=3)
+        async with profiler.stage("website_fetch"):
+            response = await client.get(url, headers=headers, follow_redirects=True, timeout=3)
         response.raise_for_status()
+        if raw:
+            return (response.content, response.encoding, str(response.url)), feature_id
         return response.text, feature_id
-    except httpx._exceptions.HTTPStatusError as e:
-        logger.error(f"Error fetching URL {url}: {e}")
-        return None, feature_id
     except Exception as e:
-        logger.error(f"An unexpected error occurred while fetching {url}: {e}")
+        if raise_errors:
+            raise
+        if isinstance(e, httpx.HTTPStatusError):
+            logger.error("Error fetching URL %s: %s", url, e)
+        else:
+            logger.error("An unexpected error occurred while fetching %s: %s", url, e)
         return None, feature_id
-
-class EmailExtractor:
-    @staticmethod
-    def extract(text):
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        mails = re.findall(email_pattern, text)
-        return list(set(mails))
-
-class InstagramExtractor:
-    @staticmethod
-    def extract(text):
-        instagram_pattern = instagram_pattern = r'(?:(?:http|https):\/\/)?(?:www\.)?(?:instagram\.com|instagr\.am|instagr\.com)\/(?!p\/|direct\/|accounts\/|call\/|explore\/|stories\/|reels\/|about\/|help\/|privacy\/|terms\/|admin\/|oauth\/|p$|direct$|accounts$|call$|explore$|stories$|reels$|about$|help$|privacy$|terms$|admin$|oauth$)([\w\.]{1,30})(?:\/[^\s]*)?'
-        usernames = re.findall(instagram_pattern, text)
-        return list(set(f"https://instagram.com/{username}" for username in usernames))
-
-class FacebookExtractor:
-    @staticmethod
-    def extract(text):
-        facebook_pattern = r'(?:https?:\/\/)?(?:www\.)?(?:mbasic\.facebook|m\.facebook|facebook|fb)\.(?:com|me)\/(?!sharer\/)(?:(?:\w\.)*#!\/)?(?:pages\/)?(?:[\w\-\.]*\/)*(?:profile\.php\?id=\d+|[\w\-]+)(?:[\/#][^\s!"\'<>?@#$%^&*()]+)?'
-        links = re.findall(facebook_pattern, text)
-        return list(set(links))
-
-class YoutubeExtractor:
-    @staticmethod
-    def extract(text):
-        youtube_pattern = r'https?:\/\/(?:www\.)?(?:youtube(?:-nocookie)?\.com\/(?:channel\/[\w-]+|c\/[\w-]+|user\/[\w-]+|@[\w-]+))'
-        links = re.findall(youtube_pattern, text)
-        return list(set(links))
-
-class LinkedinExtractor:
-    @staticmethod
-    def extract(text):
-        linkedin_pattern = r'(?:https?:\/\/)?(?:www\.)?(?:linkedin\.com\/(?:in|pub)\/[\w-]+)'
-        links = re.findall(linkedin_pattern, text)
-        return list(set(links))
-    
-class TwitterExtractor:
-    @staticmethod
-    def extract(text):
-        twitter_pattern = r'(?:https?:\/\/)?(?:www\.)?(?:twitter\.com|x\.com)\/(?:@?[\w-]+)(?=[\/]?|$)'
-        links = re.findall(twitter_pattern, text)
-        return list(set(links))
-    
-class TiktokExtractor:
-    @staticmethod
-    def extract(text):
-        tiktok_pattern = r'(?:https?:\/\/)?(?:www\.)?tiktok\.com\/@?[\w.-]+'
-        links = re.findall(tiktok_pattern, text)
-        return list(set(links))
-    
@@ -1,19 +1,30 @@
 import os
-from pages.scraper_page import ScraperPage
-from pages.settings_page import SettingsPage
+from importlib import import_module
 
 class PageManager:
-    def __init__(self):
-        self.settings_page = SettingsPage()
+    PAGE_CLASSES = {
+        "scraper_page": ("pages.scraper_page", "ScraperPage"),
+        "settings_page": ("pages.settings_page", "SettingsPage"),
+    }
 
-        self.pages = {
-            "scraper_page": ScraperPage(self.settings_page),
-            "settings_page": self.settings_page,
-        }
+    def __init__(self):
+        self.pages = {}
 
         self.base_dir = os.path.dirname(os.path.dirname(__file__))
         self.icon_dir = os.path.join(self.base_dir, 'assets/svg')
 
+    def get_page(self, page_id):
+        page = self.pages.get(page_id)
+        if page is None:
+            module_name, class_name = self.PAGE_CLASSES[page_id]
+            page_class = getattr(import_module(module_name), class_name)
+            if page_id == "scraper_page":
+                page = page_class(self.get_page("settings_page"))
+            else:
+                page = page_class()
+            self.pages[page_id] = page
+        return page
+
     def get_menu_items(self):
         return {
             "scraper_page": {"name": "Scraper", "icon": os.path.join(self.icon_dir, "solid/location-dot.svg")},
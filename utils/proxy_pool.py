@@ -0,0 +1,92 @@
+import asyncio
+import time
+from collections import deque
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROXY_FAILURE_STATUS_CODES = {407, 429}
+UNMEASURED_LATENCY = 1.0
+FAILURE_LATENCY_PENALTY = 10.0
+
+class ProxyEndpoint:
+    def __init__(self, url, requests_per_minute, sample_window=50):
+        self.url = url
+        self.requests_per_minute = requests_per_minute
+        self.latency = None
+        self.outcomes = deque(maxlen=sample_window)
+        self.request_times = deque()
+        self.ejected_until = 0.0
+        self.total_requests = 0
+        self.total_failures = 0
+
+    @property
+    def error_rate(self):
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    @property
+    def score(self):
+        latency = self.latency if self.latency is not None else UNMEASURED_LATENCY
+        return latency * (1 + 4 * self.error_rate)
+
+    def next_available_at(self, now):
+        while self.request_times and now - self.request_times[0] >= 60:
+            self.request_times.popleft()
+        if now < self.ejected_until:
+            return self.ejected_until
+        if len(self.request_times) < self.requests_per_minute:
+            return now
+        return self.request_times[0] + 60
+
+    def record(self, latency, ok):
+        self.total_requests += 1
+        self.outcomes.append(ok)
+        if not ok:
+            self.total_failures += 1
+            latency = max(latency, FAILURE_LATENCY_PENALTY)
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+
+    def __repr__(self):
+        return f"ProxyEndpoint({self.url}, latency={self.latency}, error_rate={self.error_rate:.2f})"
+
+
+class ProxyPool:
+    def __init__(self, proxy_urls, requests_per_minute=60, max_error_rate=0.5, min_samples=10, eject_seconds=120):
+        if not proxy_urls:
+            raise ValueError("Proxy pool needs at least one proxy.")
+        self.proxies = [ProxyEndpoint(url, requests_per_minute) for url in proxy_urls]
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.eject_seconds = eject_seconds
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path, 'r', encoding='utf-8') as file:
+            proxy_urls = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+        return cls(proxy_urls, **kwargs)
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            available = [proxy for proxy in self.proxies if proxy.next_available_at(now) <= now]
+            if available:
+                proxy = min(available, key=lambda candidate: candidate.score)
+                proxy.request_times.append(now)
+                return proxy
+            wait = min(proxy.next_available_at(now) for proxy in self.proxies) - now
+            await asyncio.sleep(max(wait, 0.05))
+
+    def record(self, proxy, latency, ok):
+        proxy.record(latency, ok)
+        if len(proxy.outcomes) >= self.min_samples and proxy.error_rate > self.max_error_rate:
+            proxy.ejected_until = time.monotonic() + self.eject_seconds
+            logger.warning("Ejecting %s for %d seconds.", proxy, self.eject_seconds)
+            proxy.outcomes.clear()
+
+    def log_summary(self):
+        for proxy in self.proxies:
+            logger.info(
+                "Proxy %s: %d requests, %d failures, latency %s",
+                proxy.url, proxy.total_requests, proxy.total_failures,
+                f"{proxy.latency:.3f}s" if proxy.latency is not None else "n/a"
+            )
@@ -0,0 +1,59 @@
+import time
+import httpx
+from utils.proxy_pool import PROXY_FAILURE_STATUS_CODES
+
+class ProxyResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream, pool, proxy, latency):
+        self.stream = stream
+        self.pool = pool
+        self.proxy = proxy
+        self.latency = latency
+        self.recorded = False
+
+    def _record(self, ok):
+        if not self.recorded:
+            self.recorded = True
+            self.pool.record(self.proxy, self.latency, ok)
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self.stream:
+                yield chunk
+        except httpx.TransportError:
+            self._record(False)
+            raise
+        self._record(True)
+
+    async def aclose(self):
+        await self.stream.aclose()
+        self._record(True)
+
+
+class ProxyPoolTransport(httpx.AsyncBaseTransport):
+    def __init__(self, pool, limits, http2=False):
+        self.pool = pool
+        self.transports = {
+            proxy.url: httpx.AsyncHTTPTransport(proxy=proxy.url, limits=limits, http2=http2)
+            for proxy in pool.proxies
+        }
+
+    async def handle_async_request(self, request):
+        proxy = await self.pool.acquire()
+        started = time.perf_counter()
+        try:
+            response = await self.transports[proxy.url].handle_async_request(request)
+        except httpx.UnsupportedProtocol:
+            raise
+        except httpx.TransportError:
+            self.pool.record(proxy, time.perf_counter() - started, False)
+            raise
+        latency = time.perf_counter() - started
+        if response.status_code in PROXY_FAILURE_STATUS_CODES:
+            self.pool.record(proxy, latency, False)
+            return response
+        response.stream = ProxyResponseStream(response.stream, self.pool, proxy, latency)
+        return response
+
+    async def aclose(self):
+        for transport in self.transports.values():
+            await transport.aclose()
@@ -0,0 +1,52 @@
+import time
+from collections import defaultdict
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TransportStats:
+    def __init__(self, google_host):
+        self.google_host = google_host
+        self.connections = defaultdict(int)
+        self.tls_handshakes = defaultdict(int)
+        self.latencies = defaultdict(list)
+
+    def event_hooks(self):
+        return {"request": [self.on_request], "response": [self.on_response]}
+
+    def pool_name(self, host):
+        return "google" if host == self.google_host else "web"
+
+    async def on_request(self, request):
+        pool = self.pool_name(request.url.host)
+
+        async def trace(event_name, info):
+            if event_name == "connection.connect_tcp.complete":
+                self.connections[pool] += 1
+            elif event_name == "connection.start_tls.complete":
+                self.tls_handshakes[pool] += 1
+
+        request.extensions["trace"] = trace
+        request.extensions["started_at"] = time.perf_counter()
+
+    async def on_response(self, response):
+        started_at = response.request.extensions.get("started_at")
+        if started_at is not None:
+            self.latencies[self.pool_name(response.request.url.host)].append(time.perf_counter() - started_at)
+
+    def summary(self):
+        summary = {}
+        for pool in ("google", "web"):
+            latencies = sorted(self.latencies[pool])
+            summary[pool] = {
+                "requests": len(latencies),
+                "connections": self.connections[pool],
+                "tls_handshakes": self.tls_handshakes[pool],
+                "median_latency": round(latencies[len(latencies) // 2], 3) if latencies else None,
+                "p95_latency": round(latencies[int(len(latencies) * 0.95)], 3) if latencies else None,
+            }
+        return summary
+
+    def log_summary(self):
+        for pool, values in self.summary().items():
+            logger.info("Transport stats for %s pool: %s", pool, values)